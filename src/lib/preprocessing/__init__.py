@@ -1,11 +1,23 @@
 from .core import BasePreprocessor, TrainTransformResult
 from .scalers import RobustScaler, MedianMADScaler
-from .feature_engineering import ColumnSelector, OneHotEncoder, DateTimeFeatures
+from .sketches import HyperLogLog, KLLSketch
+from .feature_engineering import (
+    ColumnSelector,
+    OneHotEncoder,
+    HashingEncoder,
+    DateTimeFeatures,
+    TemporalAggregates,
+)
+from .pipeline import ColumnTransformer, Pipeline
 from .schema import SchemaVersion, ColumnSpec, DatasetSchema
+from .profiling import ColumnProfile, DatasetProfile, profile
+from .cache import FitCache
 from .guards import (
     check_no_target_in_features,
     fit_on_train_apply_to_splits,
+    cross_fit_transform,
     assert_disjoint_indices,
+    assert_disjoint_splits,
     TemporalSplitGuard,
 )
 
@@ -16,18 +28,33 @@ __all__ = [
     # scalers
     "RobustScaler",
     "MedianMADScaler",
+    "KLLSketch",
+    "HyperLogLog",
     # features
     "ColumnSelector",
     "OneHotEncoder",
+    "HashingEncoder",
     "DateTimeFeatures",
+    "TemporalAggregates",
+    # composition
+    "Pipeline",
+    "ColumnTransformer",
     # schema
     "SchemaVersion",
     "ColumnSpec",
     "DatasetSchema",
+    # profiling
+    "profile",
+    "ColumnProfile",
+    "DatasetProfile",
+    # caching
+    "FitCache",
     # guards
     "check_no_target_in_features",
     "fit_on_train_apply_to_splits",
+    "cross_fit_transform",
     "assert_disjoint_indices",
+    "assert_disjoint_splits",
     "TemporalSplitGuard",
 ]
 
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+from typing import Any, List, Optional, Tuple, Union
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from .core import ArrayLike, BasePreprocessor, is_dataframe
+from .persistence import FORMAT_VERSION, _Encoder, load, save
+
+try:
+    import pandas as pd  # type: ignore
+except Exception:  # pragma: no cover - pandas optional
+    pd = None  # type: ignore
+
+_SUFFIX = ".fit"
+
+
+def _update_with_array(h: Any, arr: np.ndarray) -> None:
+    """Feed dtype, shape and the raw bytes of ``arr`` (no copy when contiguous)."""
+    if arr.dtype == object:
+        assert pd is not None
+        arr = pd.util.hash_pandas_object(pd.Series(arr.ravel()), index=False).to_numpy()
+    h.update(f"{arr.dtype.str}{arr.shape}".encode())
+    if arr.size:
+        h.update(np.ascontiguousarray(arr).reshape(-1).view(np.uint8))
+
+
+def _update_with_data(h: Any, X: Any) -> None:
+    if X is None:
+        h.update(b"none")
+    elif is_dataframe(X):
+        assert pd is not None
+        frame = X.to_frame() if isinstance(X, pd.Series) else X
+        h.update(json.dumps([str(c) for c in frame.columns]).encode())
+        _update_with_array(h, pd.util.hash_pandas_object(frame.index, index=False).to_numpy())
+        for i in range(frame.shape[1]):
+            col = frame.iloc[:, i]
+            h.update(str(col.dtype).encode())
+            if isinstance(col.dtype, np.dtype) and col.dtype != object:
+                _update_with_array(h, col.to_numpy())
+            else:
+                _update_with_array(h, pd.util.hash_pandas_object(col, index=False).to_numpy())
+    else:
+        _update_with_array(h, np.asarray(X))
+
+
+def _adopt_state(target: BasePreprocessor, source: BasePreprocessor) -> None:
+    """Copy ``source``'s attributes into ``target``, keeping ``target``'s nested preprocessors."""
+    for name, value in vars(source).items():
+        setattr(target, name, _adopt_value(vars(target).get(name), value))
+    target._after_load()
+
+
+def _adopt_value(current: Any, value: Any) -> Any:
+    if isinstance(value, BasePreprocessor) and type(current) is type(value):
+        _adopt_state(current, value)
+        return current
+    if isinstance(value, (list, tuple)) and type(current) is type(value) and len(current) == len(value):
+        items = [_adopt_value(c, v) for c, v in zip(current, value)]
+        return items if isinstance(value, list) else tuple(items)
+    return value
+
+
+class FitCache:
+    """Content-addressed on-disk store of fitted preprocessors.
+
+    The key is a BLAKE2b digest of the preprocessor's class and constructor
+    parameters (nested steps included) and of the training data: column
+    names, dtypes, index and the raw column buffers, hashed without copies
+    where the buffers are contiguous. Entries are files in the ``save``
+    format and are memory-mapped on a hit. Least recently used entries (by
+    modification time, refreshed on every hit) are evicted once the store
+    exceeds ``max_bytes`` or ``max_entries``.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, "os.PathLike[str]"],
+        max_bytes: Optional[int] = 1 << 30,
+        max_entries: Optional[int] = None,
+        mmap: bool = True,
+    ) -> None:
+        self.directory = os.fspath(directory)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.mmap = mmap
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def key(self, preprocessor: BasePreprocessor, X: ArrayLike, y: Optional[ArrayLike] = None) -> str:
+        h = hashlib.blake2b(digest_size=20)
+        encoder = _Encoder(include_state=False)
+        h.update(json.dumps([FORMAT_VERSION, encoder.encode(preprocessor)], sort_keys=True).encode())
+        for arr in encoder.arrays:  # array-valued parameters
+            _update_with_array(h, arr)
+        _update_with_data(h, X)
+        _update_with_data(h, y)
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + _SUFFIX)
+
+    def fit(self, preprocessor: BasePreprocessor, X: ArrayLike, y: Optional[ArrayLike] = None) -> BasePreprocessor:
+        """Fit ``preprocessor`` on ``(X, y)`` unless an identical fit is cached.
+
+        On a hit ``fit`` is skipped and the cached fitted state is adopted by
+        ``preprocessor`` in place, recursively, so nested steps the caller
+        holds are fitted exactly as after a miss; either way ``preprocessor``
+        is returned.
+        """
+        path = self._path(self.key(preprocessor, X, y))
+        cached = self._load(path)
+        if cached is not None and type(cached) is type(preprocessor):
+            _adopt_state(preprocessor, cached)
+            self.hits += 1
+            return preprocessor
+        self.misses += 1
+        preprocessor.fit(X, y)
+        save(preprocessor, path)
+        self._evict(keep=path)
+        return preprocessor
+
+    def _load(self, path: str) -> Optional[BasePreprocessor]:
+        try:
+            cached = load(path, mmap=self.mmap)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError, KeyError):
+            # Unreadable or stale-format entry: drop it and refit
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:  # pragma: no cover - evicted concurrently
+            pass
+        return cached
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(_SUFFIX):
+                path = os.path.join(self.directory, name)
+                try:
+                    st = os.stat(path)
+                except OSError:  # pragma: no cover - evicted concurrently
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+        return sorted(entries)
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        count = len(entries)
+        for _, size, path in entries:  # oldest first
+            over_bytes = self.max_bytes is not None and total > self.max_bytes
+            over_count = self.max_entries is not None and count > self.max_entries
+            if not (over_bytes or over_count):
+                break
+            if path == keep:
+                continue
+            self._remove(path)
+            total -= size
+            count -= 1
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:  # pragma: no cover - removed concurrently
+            pass
+
+    def clear(self) -> None:
+        for _, _, path in self._entries():
+            self._remove(path)
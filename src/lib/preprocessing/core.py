@@ -3,6 +3,7 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import Any, Dict, Iterable, Optional, Protocol, Tuple, Union
+import os
 
 import numpy as np
 
@@ -41,6 +42,9 @@ class BasePreprocessor(ABC):
     is_fitted: bool
     feature_names_in_: Optional[Iterable[str]]
     feature_names_out_: Optional[Iterable[str]]
+    # True when the preprocessor implements the array-level hooks below, which
+    # lets composite preprocessors pass bare ndarrays between stages.
+    _supports_numpy: bool = False
 
     def __init__(self) -> None:
         self.is_fitted = False
@@ -62,6 +66,40 @@ class BasePreprocessor(ABC):
         self.fit(X, y)
         return self.transform(X)
 
+    def _transform_numpy(self, X_np: np.ndarray) -> np.ndarray:
+        """Transform a 2D ndarray without any pandas wrapping (see ``_supports_numpy``)."""
+        raise NotImplementedError
+
+    def _inverse_transform_numpy(self, X_np: np.ndarray) -> np.ndarray:
+        """Inverse of ``_transform_numpy`` for invertible preprocessors."""
+        raise NotImplementedError
+
+    def _affine_params(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Return ``(a, b)`` when the fitted transform is exactly ``X * a + b``, else None."""
+        return None
+
+    def _sufficient_stats(self, X_np: np.ndarray) -> Optional[Any]:
+        """Mergeable statistics of a block of rows that determine ``fit``, or None if unsupported.
+
+        Preprocessors returning statistics also implement ``_merge_stats`` and
+        ``_fit_from_stats``, so fits on unions of blocks can be assembled
+        without revisiting the rows (see ``guards.cross_fit_transform``).
+        """
+        return None
+
+    def _merge_stats(self, a: Any, b: Any) -> Any:
+        """Combine the statistics of two disjoint blocks of rows."""
+        raise NotImplementedError
+
+    def _fit_from_stats(
+        self, stats: Any, n_samples: int, columns: Optional[Iterable[str]], template: np.ndarray
+    ) -> None:
+        """Set the state ``fit`` would produce on the rows summarized by ``stats``.
+
+        ``template`` is any slice of the training array; only its dtype is used.
+        """
+        raise NotImplementedError
+
     def get_state(self) -> Dict[str, Any]:
         """Return a JSON-serializable dict of the fitted state.
 
@@ -80,6 +118,25 @@ class BasePreprocessor(ABC):
         self.feature_names_in_ = state.get("feature_names_in_")
         self.feature_names_out_ = state.get("feature_names_out_")
 
+    def save(self, path: Union[str, "os.PathLike[str]"]) -> None:
+        """Write parameters and fitted state to ``path`` (see ``persistence.save``)."""
+        from .persistence import save
+
+        save(self, path)
+
+    @classmethod
+    def load(cls, path: Union[str, "os.PathLike[str]"], mmap: bool = True) -> "BasePreprocessor":
+        """Load a preprocessor written by ``save``; fitted arrays are memory-mapped by default."""
+        from .persistence import load
+
+        obj = load(path, mmap=mmap)
+        if not isinstance(obj, cls):
+            raise TypeError(f"{path} holds a {type(obj).__name__}, not a {cls.__name__}")
+        return obj
+
+    def _after_load(self) -> None:
+        """Rebuild private derived state after fitted attributes were restored by ``load``."""
+
 
 @dataclass
 class TrainTransformResult:
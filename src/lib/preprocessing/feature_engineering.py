@@ -1,16 +1,23 @@
 from __future__ import annotations
 
+import hashlib
 from typing import Dict, Iterable, List, Optional, Sequence, cast
 
 import numpy as np
 
 from .core import ArrayLike, BasePreprocessor, get_columns, is_dataframe
+from .guards import TemporalSplitGuard
 
 try:
     import pandas as pd  # type: ignore
 except Exception:  # pragma: no cover - pandas optional
     pd = None  # type: ignore
 
+try:
+    import scipy.sparse as sp  # type: ignore
+except Exception:  # pragma: no cover - scipy optional
+    sp = None  # type: ignore
+
 
 class ColumnSelector(BasePreprocessor):
     """Select a subset of columns by name (DataFrame) or index (ndarray)."""
@@ -44,33 +51,168 @@ class ColumnSelector(BasePreprocessor):
 
 
 class OneHotEncoder(BasePreprocessor):
-    """Minimal one-hot encoder for categorical columns (DataFrame only)."""
+    """Minimal one-hot encoder for categorical columns (DataFrame only).
+
+    Each column is converted to category codes once and the codes are
+    scattered into a preallocated ``uint8`` indicator block. ``output`` picks
+    the result type: ``"pandas"`` returns the passthrough columns followed by
+    the indicators as a DataFrame, while ``"numpy"`` (dense ``uint8`` array) and
+    ``"sparse"`` (scipy CSR matrix) return only the indicator columns, named by
+    ``feature_names_out_``.
 
-    def __init__(self, columns: Sequence[str], drop_first: bool = False) -> None:
+    Levels seen fewer than ``min_frequency`` times (a count, or a fraction of
+    the rows when a float below 1) are collapsed into one ``{col}__infrequent``
+    column, as are the least frequent levels beyond ``max_categories`` output
+    columns per feature (the infrequent column counts toward the cap).
+    ``handle_unknown`` decides what unseen values become at transform time:
+    all-zero rows (``"ignore"``), the infrequent column (``"infrequent"``), or a
+    ``ValueError`` (``"error"``). Missing values always encode as all zeros.
+    A retained category literally named ``"infrequent"`` would share that
+    column's name, so ``fit`` rejects it whenever the column is created.
+    """
+
+    def __init__(
+        self,
+        columns: Sequence[str],
+        drop_first: bool = False,
+        output: str = "pandas",  # 'pandas' | 'numpy' | 'sparse'
+        min_frequency: Optional[float] = None,
+        max_categories: Optional[int] = None,
+        handle_unknown: str = "ignore",  # 'ignore' | 'infrequent' | 'error'
+    ) -> None:
         super().__init__()
+        if output not in ("pandas", "numpy", "sparse"):
+            raise ValueError("output must be 'pandas', 'numpy', or 'sparse'")
+        if output == "sparse" and sp is None:
+            raise ImportError("OneHotEncoder(output='sparse') requires scipy.")
+        if handle_unknown not in ("ignore", "infrequent", "error"):
+            raise ValueError("handle_unknown must be 'ignore', 'infrequent', or 'error'")
+        if min_frequency is not None and min_frequency <= 0:
+            raise ValueError("min_frequency must be positive")
+        if max_categories is not None and max_categories < 1:
+            raise ValueError("max_categories must be >= 1")
         self.columns = list(columns)
         self.drop_first = drop_first
-        self.categories_: Dict[str, List[str]] = {}
+        self.output = output
+        self.min_frequency = min_frequency
+        self.max_categories = max_categories
+        self.handle_unknown = handle_unknown
+        self.categories_: Dict[str, List[str]] = {}  # levels with their own output column
+        self.levels_: Dict[str, List[str]] = {}  # every level seen in fit, in category order
+        self.category_counts_: Dict[str, np.ndarray] = {}  # fit counts aligned with levels_
+        self.infrequent_categories_: Dict[str, List[str]] = {}
+        self._lookups: Optional[Dict[str, np.ndarray]] = None
 
     def fit(self, X: ArrayLike, y: Optional[ArrayLike] = None) -> "OneHotEncoder":  # noqa: ARG002
         if not is_dataframe(X):
             raise TypeError("OneHotEncoder requires a pandas DataFrame input.")
         assert pd is not None
         self.feature_names_in_ = list(X.columns)  # type: ignore[attr-defined]
+        n_rows = len(X)  # type: ignore[arg-type]
         for col in self.columns:
-            cats = pd.Index(X[col].astype("category").cat.categories).tolist()
+            cat = X[col].astype("category").cat
+            levels = pd.Index(cat.categories).tolist()
+            codes = np.asarray(cat.codes)
+            counts = np.bincount(codes[codes >= 0], minlength=len(levels))
+            frequent = self._frequent_mask(counts, n_rows)
+            cats = [lvl for lvl, keep in zip(levels, frequent) if keep]
             if self.drop_first and cats:
                 cats = cats[1:]
+            self.levels_[col] = levels
+            self.category_counts_[col] = counts
             self.categories_[col] = cats
+            self.infrequent_categories_[col] = [lvl for lvl, keep in zip(levels, frequent) if not keep]
+            if self._has_infrequent_column(col) and any(str(cat) == "infrequent" for cat in cats):
+                raise ValueError(
+                    f"Column '{col}' has a category 'infrequent', whose output column would clash with "
+                    f"'{col}__infrequent'; rename the category or disable infrequent grouping"
+                )
+        self._lookups = None
         # Compute feature names out
         other_cols = [c for c in self.feature_names_in_ if c not in self.columns]  # type: ignore[operator]
-        ohe_cols: List[str] = []
-        for col, cats in self.categories_.items():
-            ohe_cols.extend([f"{col}__{cat}" for cat in cats])
-        self.feature_names_out_ = [*other_cols, *ohe_cols]
+        ohe_cols = self._encoded_names()
+        self.feature_names_out_ = [*other_cols, *ohe_cols] if self.output == "pandas" else ohe_cols
         self.is_fitted = True
         return self
 
+    def _frequent_mask(self, counts: np.ndarray, n_rows: int) -> np.ndarray:
+        keep = np.ones(counts.shape[0], dtype=bool)
+        if self.min_frequency is not None:
+            min_count = self.min_frequency * n_rows if self.min_frequency < 1 else self.min_frequency
+            keep &= counts >= min_count
+        n_out = int(keep.sum()) + int(not keep.all() or self.handle_unknown == "infrequent")
+        if self.max_categories is not None and n_out > self.max_categories:
+            # Reserve one output for the infrequent column; ties keep the earlier level
+            order = np.argsort(-counts, kind="stable")
+            top = order[keep[order]][: self.max_categories - 1]
+            keep = np.zeros_like(keep)
+            keep[top] = True
+        return keep
+
+    def _has_infrequent_column(self, col: str) -> bool:
+        return bool(self.infrequent_categories_.get(col)) or self.handle_unknown == "infrequent"
+
+    def _encoded_names(self) -> List[str]:
+        names: List[str] = []
+        for col in self.columns:
+            names.extend(f"{col}__{cat}" for cat in self.categories_[col])
+            if self._has_infrequent_column(col):
+                names.append(f"{col}__infrequent")
+        return names
+
+    def _build_lookups(self) -> Dict[str, np.ndarray]:
+        """Per column, map fitted level code -> output position (-1 for none).
+
+        The extra last entry is the target of code -1 (values outside
+        ``levels_``), so codes index the table directly.
+        """
+        lookups: Dict[str, np.ndarray] = {}
+        offset = 0
+        for col in self.columns:
+            levels = self.levels_[col]
+            position = {cat: offset + i for i, cat in enumerate(self.categories_[col])}
+            offset += len(self.categories_[col])
+            infrequent = -1
+            if self._has_infrequent_column(col):
+                infrequent = offset
+                offset += 1
+            infrequent_set = set(self.infrequent_categories_[col])
+            table = np.full(len(levels) + 1, -1, dtype=np.intp)
+            for code, lvl in enumerate(levels):
+                table[code] = position.get(lvl, infrequent if lvl in infrequent_set else -1)
+            if self.handle_unknown == "infrequent":
+                table[-1] = infrequent
+            lookups[col] = table
+        return lookups
+
+    def _indicator_positions(self, df: "pd.DataFrame") -> tuple[np.ndarray, np.ndarray, int]:
+        """Row and output-column index of every set indicator, plus the block width."""
+        assert pd is not None
+        if self._lookups is None:
+            self._lookups = self._build_lookups()
+        rows: List[np.ndarray] = []
+        cols: List[np.ndarray] = []
+        all_rows = np.arange(len(df))
+        for col in self.columns:
+            values = df[col]
+            codes = np.asarray(pd.Categorical(values, categories=self.levels_[col]).codes, dtype=np.intp)
+            if self.handle_unknown != "ignore":
+                outside = codes < 0
+                missing = values.isna().to_numpy()
+                if self.handle_unknown == "error" and (outside & ~missing).any():
+                    unknown = pd.unique(values[outside & ~missing])
+                    raise ValueError(f"Found unknown categories {list(unknown)} in column {col!r}")
+            positions = self._lookups[col][codes]
+            if self.handle_unknown == "infrequent":
+                positions[missing] = -1  # missing values stay all-zero
+            hit = positions >= 0
+            rows.append(all_rows[hit])
+            cols.append(positions[hit])
+        width = len(self._encoded_names())
+        if not rows:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp), width
+        return np.concatenate(rows), np.concatenate(cols), width
+
     def transform(self, X: ArrayLike) -> ArrayLike:
         if not self.is_fitted:
             raise RuntimeError("OneHotEncoder must be fitted before transform().")
@@ -78,41 +220,261 @@ class OneHotEncoder(BasePreprocessor):
         if not is_dataframe(X):
             raise TypeError("OneHotEncoder requires a pandas DataFrame input.")
         df: pd.DataFrame = X  # type: ignore[assignment]
+        rows, cols, width = self._indicator_positions(df)
+        if self.output == "sparse":
+            assert sp is not None
+            data = np.ones(rows.shape[0], dtype=np.uint8)
+            return sp.csr_matrix((data, (rows, cols)), shape=(len(df), width))
+        block = np.zeros((len(df), width), dtype=np.uint8)
+        block[rows, cols] = 1
+        if self.output == "numpy":
+            return block
         df_other = df.drop(columns=self.columns, errors="ignore")
-        ohe_frames: List[pd.DataFrame] = [df_other]
-        for col, cats in self.categories_.items():
-            present = pd.Categorical(df[col], categories=[*([None] if False else []), *cats])
-            frame = pd.DataFrame({f"{col}__{cat}": (present == cat).astype(int) for cat in cats}, index=df.index)
-            ohe_frames.append(frame)
-        result = pd.concat(ohe_frames, axis=1)
-        # Reorder columns if feature_names_out_ is known
-        if self.feature_names_out_:
-            result = result.reindex(columns=self.feature_names_out_)
-        return result
+        return pd.concat([df_other, pd.DataFrame(block, index=df.index, columns=self._encoded_names())], axis=1)
+
+
+def _mix64(h: np.ndarray) -> np.ndarray:
+    """SplitMix64 finalizer; spreads salted hashes over all 64 bits."""
+    h = h ^ (h >> np.uint64(30))
+    h = h * np.uint64(0xBF58476D1CE4E5B9)
+    h = h ^ (h >> np.uint64(27))
+    h = h * np.uint64(0x94D049BB133111EB)
+    return h ^ (h >> np.uint64(31))
+
+
+class HashingEncoder(BasePreprocessor):
+    """Hash categorical values into a fixed number of shared output columns.
+
+    Stateless: there is nothing to learn, so the encoder is usable without
+    ``fit`` and memory does not grow with the number of distinct values. Each
+    value is rendered as a string and hashed with ``pd.util.hash_array`` (keyed
+    SipHash, stable across processes), salted per column so equal values in
+    different columns land in different buckets. With ``alternate_sign`` an
+    independent hash bit chooses +1/-1, so collisions cancel in expectation
+    instead of accumulating. Missing values contribute nothing.
+
+    ``output`` works as in ``OneHotEncoder``: ``"pandas"`` keeps passthrough
+    columns followed by ``hash__{i}`` columns, ``"numpy"`` and ``"sparse"``
+    return only the ``n_features`` hashed columns.
+    """
+
+    def __init__(
+        self,
+        columns: Sequence[str],
+        n_features: int = 1024,
+        alternate_sign: bool = True,
+        output: str = "pandas",  # 'pandas' | 'numpy' | 'sparse'
+        hash_key: str = "0123456789123456",
+    ) -> None:
+        super().__init__()
+        if n_features < 1:
+            raise ValueError("n_features must be >= 1")
+        if output not in ("pandas", "numpy", "sparse"):
+            raise ValueError("output must be 'pandas', 'numpy', or 'sparse'")
+        if output == "sparse" and sp is None:
+            raise ImportError("HashingEncoder(output='sparse') requires scipy.")
+        if len(hash_key.encode("utf8")) != 16:
+            raise ValueError("hash_key must encode to 16 bytes")
+        self.columns = list(columns)
+        self.n_features = int(n_features)
+        self.alternate_sign = alternate_sign
+        self.output = output
+        self.hash_key = hash_key
+        self.hashed_names = [f"hash__{i}" for i in range(self.n_features)]
+        self.is_fitted = True  # nothing to learn
+
+    def fit(self, X: ArrayLike, y: Optional[ArrayLike] = None) -> "HashingEncoder":  # noqa: ARG002
+        if not is_dataframe(X):
+            raise TypeError("HashingEncoder requires a pandas DataFrame input.")
+        self.feature_names_in_ = get_columns(X)
+        others = [c for c in (self.feature_names_in_ or []) if c not in self.columns]
+        self.feature_names_out_ = [*others, *self.hashed_names] if self.output == "pandas" else self.hashed_names
+        return self
+
+    def _hash_column(self, col: str, values: "pd.Series") -> tuple[np.ndarray, np.ndarray]:
+        """Row positions of non-missing values and their salted 64-bit hashes."""
+        assert pd is not None
+        present = np.flatnonzero(values.notna().to_numpy())
+        strings = values.to_numpy()[present].astype(str).astype(object)
+        salt = pd.util.hash_array(np.array([col], dtype=object), hash_key=self.hash_key)
+        return present, _mix64(pd.util.hash_array(strings, hash_key=self.hash_key) ^ salt[0])
+
+    def transform(self, X: ArrayLike) -> ArrayLike:
+        if not is_dataframe(X):
+            raise TypeError("HashingEncoder requires a pandas DataFrame input.")
+        assert pd is not None
+        df: pd.DataFrame = X  # type: ignore[assignment]
+        n_rows = len(df)
+        rows: List[np.ndarray] = []
+        buckets: List[np.ndarray] = []
+        signs: List[np.ndarray] = []
+        for col in self.columns:
+            present, h = self._hash_column(col, df[col])
+            rows.append(present)
+            buckets.append((h % np.uint64(self.n_features)).astype(np.intp))
+            if self.alternate_sign:
+                signs.append(np.where(h >> np.uint64(63), -1.0, 1.0))
+            else:
+                signs.append(np.ones(present.shape[0]))
+        row = np.concatenate(rows) if rows else np.empty(0, dtype=np.intp)
+        bucket = np.concatenate(buckets) if buckets else np.empty(0, dtype=np.intp)
+        sign = np.concatenate(signs) if signs else np.empty(0)
+        if self.output == "sparse":
+            assert sp is not None
+            mat = sp.csr_matrix((sign, (row, bucket)), shape=(n_rows, self.n_features))
+            mat.sum_duplicates()
+            mat.eliminate_zeros()  # signed collisions that cancelled out
+            return mat
+        flat = np.bincount(row * self.n_features + bucket, weights=sign, minlength=n_rows * self.n_features)
+        block = flat.reshape(n_rows, self.n_features)
+        if self.output == "numpy":
+            return block
+        df_other = df.drop(columns=self.columns, errors="ignore")
+        return pd.concat([df_other, pd.DataFrame(block, index=df.index, columns=self.hashed_names)], axis=1)
+
+
+_NS_PER_DAY = 86_400 * 10**9
+_NAT = np.iinfo(np.int64).min
+# Period of each cyclical feature (value is taken 0-based before encoding)
+_CYCLE_PERIODS = {"month": 12, "day": 31, "dow": 7, "hour": 24, "minute": 60, "week": 53}
+_DATETIME_FEATURES = ("year", "month", "day", "dow", "hour", "minute", "week", "is_weekend")
+
+
+def _guess_format(values: "pd.Series") -> Optional[str]:
+    """strftime format of the first non-null string, if pandas can infer one."""
+    try:
+        from pandas.tseries.api import guess_datetime_format  # pandas >= 2.2
+    except Exception:  # pragma: no cover - older pandas parses without a cached format
+        return None
+    sample = values.dropna()
+    if sample.empty or not isinstance(sample.iloc[0], str):
+        return None
+    return guess_datetime_format(sample.iloc[0])
+
+
+def _civil_from_days(days: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Proleptic Gregorian (year, month, day) from days since 1970-01-01 (H. Hinnant's algorithm)."""
+    z = days + 719_468
+    era = np.floor_divide(z, 146_097)
+    doe = z - era * 146_097
+    yoe = (doe - doe // 1460 + doe // 36_524 - doe // 146_096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    day = doy - (153 * mp + 2) // 5 + 1
+    month = np.where(mp < 10, mp + 3, mp - 9)
+    year = yoe + era * 400 + (month <= 2)
+    return year, month, day
+
+
+def _days_from_jan1(year: np.ndarray) -> np.ndarray:
+    """Days since 1970-01-01 of January 1st of ``year``."""
+    y = year - 1  # January counts as month 13 of the previous year
+    era = np.floor_divide(y, 400)
+    yoe = y - era * 400
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + 306
+    return era * 146_097 + doe - 719_468
+
+
+def _datetime_components(ns: np.ndarray, names: Iterable[str]) -> Dict[str, np.ndarray]:
+    """Calendar fields of int64 epoch nanoseconds (wall time) in one vectorized pass."""
+    wanted = set(names)
+    days = np.floor_divide(ns, _NS_PER_DAY)
+    dow = (days + 3) % 7  # 1970-01-01 was a Thursday; Monday == 0
+    out: Dict[str, np.ndarray] = {}
+    if wanted & {"year", "month", "day"}:
+        out["year"], out["month"], out["day"] = _civil_from_days(days)
+    if "dow" in wanted:
+        out["dow"] = dow
+    if "hour" in wanted:
+        out["hour"] = np.floor_divide(ns, 3_600 * 10**9) % 24
+    if "minute" in wanted:
+        out["minute"] = np.floor_divide(ns, 60 * 10**9) % 60
+    if "week" in wanted:
+        # ISO week: the week belongs to the year holding its Thursday
+        thursday = days - dow + 3
+        iso_year = _civil_from_days(thursday)[0]
+        out["week"] = (thursday - _days_from_jan1(iso_year)) // 7 + 1
+    if "is_weekend" in wanted:
+        out["is_weekend"] = dow >= 5
+    return out
 
 
 class DateTimeFeatures(BasePreprocessor):
-    """Extract common datetime-derived features from datetime columns."""
+    """Extract common datetime-derived features from datetime columns.
 
-    def __init__(self, columns: Sequence[str], features: Sequence[str] = ("year", "month", "day", "dow", "hour")) -> None:
+    Columns already in ``datetime64`` form are used as-is; string columns are
+    parsed with the format inferred during ``fit`` (``formats_``), falling back
+    to free-form parsing for values that do not match it. All fields are then
+    computed from the int64 epoch nanoseconds in one vectorized pass.
+
+    ``cyclical`` lists periodic features (month, day, dow, hour, minute, week)
+    to additionally encode as ``{col}_{feature}_sin``/``_cos`` pairs. Timezone
+    aware columns yield fields in their own wall time, or in ``tz`` when given
+    (naive columns are then taken to be UTC).
+    """
+
+    def __init__(
+        self,
+        columns: Sequence[str],
+        features: Sequence[str] = ("year", "month", "day", "dow", "hour"),
+        cyclical: Sequence[str] = (),
+        tz: Optional[str] = None,
+    ) -> None:
         super().__init__()
+        unknown = [f for f in features if f not in _DATETIME_FEATURES]
+        if unknown:
+            raise ValueError(f"Unknown datetime features {unknown}; expected a subset of {list(_DATETIME_FEATURES)}")
+        not_cyclic = [f for f in cyclical if f not in _CYCLE_PERIODS]
+        if not_cyclic:
+            raise ValueError(f"Features {not_cyclic} cannot be encoded cyclically")
         self.columns = list(columns)
         self.features = list(features)
+        self.cyclical = list(cyclical)
+        self.tz = tz
+        self.formats_: Dict[str, Optional[str]] = {}
 
     def fit(self, X: ArrayLike, y: Optional[ArrayLike] = None) -> "DateTimeFeatures":  # noqa: ARG002
         if not is_dataframe(X):
             raise TypeError("DateTimeFeatures requires a pandas DataFrame input.")
+        assert pd is not None
         self.feature_names_in_ = get_columns(X)
+        self.formats_ = {
+            col: None if pd.api.types.is_datetime64_any_dtype(X[col]) else _guess_format(X[col])  # type: ignore[index]
+            for col in self.columns
+        }
         # feature names out are input cols + derived cols
         derived: List[str] = []
         for col in self.columns:
             for f in self.features:
                 derived.append(f"{col}_{f}")
+            for f in self.cyclical:
+                derived.extend([f"{col}_{f}_sin", f"{col}_{f}_cos"])
         others = [c for c in (self.feature_names_in_ or []) if c not in self.columns]
         self.feature_names_out_ = [*others, *derived]
         self.is_fitted = True
         return self
 
+    def _to_datetime(self, col: str, values: "pd.Series") -> "pd.Series":
+        assert pd is not None
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return values
+        fmt = self.formats_.get(col)
+        if fmt is None:
+            return pd.to_datetime(values, errors="coerce")
+        parsed = pd.to_datetime(values, format=fmt, errors="coerce")
+        retry = parsed.isna() & values.notna()
+        if retry.any():
+            parsed[retry] = pd.to_datetime(values[retry], errors="coerce")
+        return parsed
+
+    def _wall_time_ns(self, s: "pd.Series") -> np.ndarray:
+        if self.tz is not None:
+            s = s.dt.tz_localize("UTC") if s.dt.tz is None else s
+            s = s.dt.tz_convert(self.tz)
+        if s.dt.tz is not None:
+            s = s.dt.tz_localize(None)  # keep local wall time
+        return np.asarray(s.to_numpy(dtype="datetime64[ns]")).view(np.int64)
+
     def transform(self, X: ArrayLike) -> ArrayLike:
         if not self.is_fitted:
             raise RuntimeError("DateTimeFeatures must be fitted before transform().")
@@ -120,20 +482,223 @@ class DateTimeFeatures(BasePreprocessor):
             raise TypeError("DateTimeFeatures requires a pandas DataFrame input.")
         assert pd is not None
         df: pd.DataFrame = X  # type: ignore[assignment]
-        out = df.drop(columns=self.columns, errors="ignore").copy()
+        data: Dict[str, ArrayLike] = {c: df[c] for c in df.columns if c not in self.columns}
         for col in self.columns:
-            s = pd.to_datetime(df[col], errors="coerce")
-            if "year" in self.features:
-                out[f"{col}_year"] = s.dt.year
-            if "month" in self.features:
-                out[f"{col}_month"] = s.dt.month
-            if "day" in self.features:
-                out[f"{col}_day"] = s.dt.day
-            if "dow" in self.features:
-                out[f"{col}_dow"] = s.dt.dayofweek
-            if "hour" in self.features:
-                out[f"{col}_hour"] = s.dt.hour
-        if self.feature_names_out_:
+            ns = self._wall_time_ns(self._to_datetime(col, df[col]))
+            missing = ns == _NAT
+            parts = _datetime_components(np.where(missing, 0, ns), [*self.features, *self.cyclical])
+            for f in self.features:
+                values = parts[f].astype(bool if f == "is_weekend" else np.int32)
+                if missing.any():
+                    values = np.where(missing, np.nan, values)
+                data[f"{col}_{f}"] = values
+            for f in self.cyclical:
+                angle = (parts[f] - (1 if f in ("month", "day", "week") else 0)) * (2.0 * np.pi / _CYCLE_PERIODS[f])
+                data[f"{col}_{f}_sin"] = np.where(missing, np.nan, np.sin(angle))
+                data[f"{col}_{f}_cos"] = np.where(missing, np.nan, np.cos(angle))
+        out = pd.DataFrame(data, index=df.index)
+        if self.feature_names_out_ and list(out.columns) != list(self.feature_names_out_):
             out = out.reindex(columns=self.feature_names_out_)
         return out
 
+
+class TemporalAggregates(BasePreprocessor):
+    """Per-entity lag and trailing-window features over an event time column.
+
+    For every row, within its ``group_column`` entity (or globally when None):
+
+    - ``{time_column}_since_prev``: seconds since the entity's previous event
+    - ``{v}_lag1``: previous event's value, for each of ``value_columns``
+    - ``events_{w}``: events in the window ``(t - w, t]`` for each of ``windows``
+    - ``{v}_mean_{w}``: mean of non-missing values in that window
+
+    All features come from one lexsort of events together with the window
+    boundaries, followed by prefix sums, so the cost is one sort regardless of
+    the number of windows. Events sharing a timestamp all fall in each other's
+    windows. Rows with a missing time get NaN features.
+
+    ``fit`` keeps the tail of the training events needed by the longest window
+    (``history_``); ``transform`` prepends it so validation rows see their
+    training-time context, and refuses data that starts before the training
+    data ends (``TemporalSplitGuard``). The training frame itself, whether
+    passed to ``fit_transform`` or back to ``transform`` after ``fit``, gets
+    features computed from the training data alone; it is recognised by its
+    length and first/last index labels (``train_fingerprint_``) and, only
+    when those match, a digest of its index and source columns
+    (``train_digest_``).
+
+    ``history_`` is not advanced by ``transform``: every batch is aggregated
+    against the training history plus its own rows, so consecutive inference
+    batches do not see each other. To stream, pass the batches to
+    ``transform`` together, or refit on the data seen so far.
+    """
+
+    def __init__(
+        self,
+        time_column: str,
+        group_column: Optional[str] = None,
+        value_columns: Sequence[str] = (),
+        windows: Sequence[str] = ("1h", "24h", "7d"),
+    ) -> None:
+        super().__init__()
+        if pd is None:  # pragma: no cover
+            raise ImportError("TemporalAggregates requires pandas.")
+        self.time_column = time_column
+        self.group_column = group_column
+        self.value_columns = list(value_columns)
+        self.windows = list(windows)
+        self._window_ns = [int(pd.Timedelta(w).value) for w in self.windows]
+        if any(w <= 0 for w in self._window_ns):
+            raise ValueError("windows must be positive durations")
+        self.history_: Optional["pd.DataFrame"] = None
+        self.train_fingerprint_: Optional[tuple] = None
+        self.train_digest_: Optional[str] = None
+
+    def _source_columns(self) -> List[str]:
+        group = [self.group_column] if self.group_column is not None else []
+        return [self.time_column, *group, *self.value_columns]
+
+    def _derived_names(self) -> List[str]:
+        names = [f"{self.time_column}_since_prev", *[f"{v}_lag1" for v in self.value_columns]]
+        for w in self.windows:
+            names.append(f"events_{w}")
+            names.extend(f"{v}_mean_{w}" for v in self.value_columns)
+        return names
+
+    @staticmethod
+    def _fingerprint(frame: "pd.DataFrame") -> tuple:
+        """Cheap identity check: row count and the first and last index labels."""
+        return (len(frame), frame.index[0], frame.index[-1]) if len(frame) else (0, None, None)
+
+    def _is_training_frame(self, frame: "pd.DataFrame") -> bool:
+        if self._fingerprint(frame) != self.train_fingerprint_:
+            return False
+        return self._digest(frame) == self.train_digest_
+
+    def _digest(self, frame: "pd.DataFrame") -> str:
+        assert pd is not None
+        hashes = pd.util.hash_pandas_object(frame[self._source_columns()], index=True).to_numpy()
+        return hashlib.blake2b(hashes.tobytes(), digest_size=16).hexdigest()
+
+    def _time_ns(self, values: "pd.Series") -> np.ndarray:
+        assert pd is not None
+        t = pd.to_datetime(values, errors="coerce")
+        if t.dt.tz is not None:
+            t = t.dt.tz_convert("UTC").dt.tz_localize(None)
+        return np.asarray(t.to_numpy(dtype="datetime64[ns]")).view(np.int64)
+
+    def _event_order(self, frame: "pd.DataFrame") -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Indices of timed rows sorted by (group, time), with their group codes and times."""
+        assert pd is not None
+        t = self._time_ns(frame[self.time_column])
+        if self.group_column is not None:
+            g = pd.factorize(frame[self.group_column], use_na_sentinel=False)[0]
+        else:
+            g = np.zeros(len(frame), dtype=np.intp)
+        timed = np.flatnonzero(t != _NAT)
+        order = timed[np.lexsort((t[timed], g[timed]))]
+        return order, g[order], t[order]
+
+    def _compute(self, frame: "pd.DataFrame") -> Dict[str, np.ndarray]:
+        n = len(frame)
+        order, gs, ts = self._event_order(frame)
+        m = order.size
+        out: Dict[str, np.ndarray] = {}
+
+        new_group = np.ones(m, dtype=bool)
+        new_group[1:] = gs[1:] != gs[:-1]
+        since = np.empty(m)
+        since[1:] = (ts[1:] - ts[:-1]) / 1e9
+        since[new_group] = np.nan
+        out[f"{self.time_column}_since_prev"] = self._scatter(since, order, n)
+        values = {v: frame[v].to_numpy(dtype=float)[order] for v in self.value_columns}
+        for v, vals in values.items():
+            lag = np.empty(m)
+            lag[1:] = vals[:-1]
+            lag[new_group] = np.nan
+            out[f"{v}_lag1"] = self._scatter(lag, order, n)
+
+        if self.windows:
+            # Merge events (kind 0) with window end/start queries (kind 1); an event
+            # sorting before a query at the same time makes windows (t - w, t].
+            n_q = len(self.windows) + 1
+            q_t = np.concatenate([ts, *[ts - w for w in self._window_ns]])
+            all_t = np.concatenate([ts, q_t])
+            all_g = np.concatenate([gs, np.tile(gs, n_q)])
+            kind = np.concatenate([np.zeros(m, dtype=np.int8), np.ones(m * n_q, dtype=np.int8)])
+            merged = np.lexsort((kind, all_t, all_g))
+            seen = np.empty(all_t.size, dtype=np.intp)
+            seen[merged] = np.cumsum(kind[merged] == 0)  # events at or before each entry
+            bounds = seen[m:].reshape(n_q, m)
+            end = bounds[0]
+            prefix = {}
+            for v, vals in values.items():
+                ok = ~np.isnan(vals)
+                prefix[v] = (
+                    np.concatenate([[0.0], np.cumsum(np.where(ok, vals, 0.0))]),
+                    np.concatenate([[0], np.cumsum(ok)]),
+                )
+            for w, start in zip(self.windows, bounds[1:]):
+                out[f"events_{w}"] = self._scatter((end - start).astype(float), order, n)
+                for v, (sums, counts) in prefix.items():
+                    with np.errstate(invalid="ignore", divide="ignore"):  # empty windows give NaN
+                        mean = (sums[end] - sums[start]) / (counts[end] - counts[start])
+                    out[f"{v}_mean_{w}"] = self._scatter(mean, order, n)
+        return out
+
+    @staticmethod
+    def _scatter(sorted_values: np.ndarray, order: np.ndarray, n: int) -> np.ndarray:
+        result = np.full(n, np.nan)
+        result[order] = sorted_values
+        return result
+
+    def fit(self, X: ArrayLike, y: Optional[ArrayLike] = None) -> "TemporalAggregates":  # noqa: ARG002
+        if not is_dataframe(X):
+            raise TypeError("TemporalAggregates requires a pandas DataFrame input.")
+        assert pd is not None
+        df: pd.DataFrame = X  # type: ignore[assignment]
+        missing = [c for c in self._source_columns() if c not in df.columns]
+        if missing:
+            raise KeyError(f"Columns not found: {missing}")
+        self.feature_names_in_ = get_columns(X)
+        self.feature_names_out_ = [*df.columns, *self._derived_names()]
+        # Later rows can only reach back max(windows) before the training end, plus
+        # each entity's last event for the lag features.
+        order, gs, ts = self._event_order(df)
+        keep = np.zeros(order.size, dtype=bool)
+        if order.size:
+            keep[-1] = True
+            keep[:-1] = gs[:-1] != gs[1:]  # last event of each entity
+            if self.windows:
+                keep |= ts > ts.max() - max(self._window_ns)
+        self.history_ = df.iloc[np.sort(order[keep])][self._source_columns()].copy()
+        self.train_fingerprint_ = self._fingerprint(df)
+        self.train_digest_ = self._digest(df)
+        self.is_fitted = True
+        return self
+
+    def transform(self, X: ArrayLike) -> ArrayLike:
+        if not self.is_fitted:
+            raise RuntimeError("TemporalAggregates must be fitted before transform().")
+        if not is_dataframe(X):
+            raise TypeError("TemporalAggregates requires a pandas DataFrame input.")
+        assert pd is not None and self.history_ is not None
+        df: pd.DataFrame = X  # type: ignore[assignment]
+        if self._is_training_frame(df):
+            return self._assemble(df, self._compute(df))
+        TemporalSplitGuard(self.time_column).validate(self.history_, df)
+        context = pd.concat([self.history_, df[self._source_columns()]], ignore_index=True)
+        features = self._compute(context)
+        n_hist = len(self.history_)
+        return self._assemble(df, {k: v[n_hist:] for k, v in features.items()})
+
+    def fit_transform(self, X: ArrayLike, y: Optional[ArrayLike] = None) -> ArrayLike:
+        self.fit(X, y)
+        df: pd.DataFrame = X  # type: ignore[assignment]
+        return self._assemble(df, self._compute(df))
+
+    def _assemble(self, df: "pd.DataFrame", features: Dict[str, np.ndarray]) -> "pd.DataFrame":
+        assert pd is not None
+        data: Dict[str, ArrayLike] = {c: df[c] for c in df.columns}
+        data.update(features)
+        return pd.DataFrame(data, index=df.index)
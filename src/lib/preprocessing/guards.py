@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Optional, Sequence, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+import copy
 
 import numpy as np
 
+from .cache import FitCache
 from .core import ArrayLike, BasePreprocessor, TrainTransformResult, get_columns, is_dataframe
+from .scalers import _to_numpy_2d
 
 try:
     import pandas as pd  # type: ignore
@@ -13,11 +17,122 @@ except Exception:  # pragma: no cover - pandas optional
     pd = None  # type: ignore
 
 
-def check_no_target_in_features(X: ArrayLike, y: Optional[ArrayLike], target_name: Optional[str] = None) -> None:
+# Rows per block when accumulating correlation moments
+_CORR_BLOCK_ROWS = 8192
+
+
+def _fingerprint(values: "pd.Series") -> int:
+    """Order-dependent 64-bit hash of a column, from one vectorized pass."""
+    assert pd is not None
+    hashed = pd.util.hash_pandas_object(values, index=False).to_numpy()
+    weights = pd.util.hash_array(np.arange(len(hashed), dtype=np.int64)) | np.uint64(1)
+    return int(weights @ hashed)
+
+
+def _allclose_candidates(A: np.ndarray, y_vals: np.ndarray, rtol: float = 1e-5, atol: float = 1e-8) -> np.ndarray:
+    """Columns of ``A`` that may satisfy ``np.allclose(A[:, j], y, equal_nan=True)``.
+
+    Rows where ``y`` is NaN or +/-inf must hold the same value in a matching
+    column, so they are compared for equality first and left out of the
+    projection. The remaining rows of every column and of ``y`` are
+    projected onto one random +/-1 vector (a single matrix-vector product).
+    ``allclose`` bounds ``|x_i - y_i|`` elementwise, so it also bounds the
+    projected difference; columns outside twice that bound (headroom for
+    rounding) cannot match. Columns whose projection is NaN stay candidates.
+    """
+    signs = np.random.default_rng(0).choice(np.array([-1.0, 1.0]), size=len(y_vals))
+    finite = np.isfinite(y_vals)
+    keep = np.ones(A.shape[1], dtype=bool)
+    if not finite.all():
+        rows = np.flatnonzero(~finite)
+        A_rows, y_rows = A[rows], y_vals[rows, None]
+        keep = ((A_rows == y_rows) | (np.isnan(A_rows) & np.isnan(y_rows))).all(axis=0)
+        signs[rows] = 0.0
+        y_vals = np.where(finite, y_vals, 0.0)
+    with np.errstate(invalid="ignore"):
+        proj = signs @ A
+        # Non-finite values on the excluded rows still poison 0 * x; re-project the columns that matched there
+        redo = np.flatnonzero(keep & np.isnan(proj))
+        if redo.size and not finite.all():
+            proj[redo] = signs[finite] @ A[np.ix_(finite, redo)]
+        target = signs @ y_vals
+        bound = 2.0 * (len(y_vals) * atol + rtol * np.abs(y_vals).sum())
+        return np.flatnonzero(keep & (np.isnan(proj) | (np.abs(proj - target) <= bound)))
+
+
+def _correlations(A: np.ndarray, y_vals: np.ndarray) -> np.ndarray:
+    """Pearson correlation of every column of ``A`` with ``y`` over pairwise-complete rows.
+
+    Moments are accumulated over row blocks, each a matrix-vector product
+    against ``y``, on values shifted by the first block's means so the
+    raw-moment formula stays well conditioned.
+    """
+    rows = ~np.isnan(y_vals)
+    if not rows.all():
+        A, y_vals = A[rows], y_vals[rows]
+    n_features = A.shape[1]
+    n, sx, sxx, sy, syy, sxy = (np.zeros(n_features) for _ in range(6))
+    shift_x, shift_y = None, float(y_vals[:_CORR_BLOCK_ROWS].mean()) if len(y_vals) else 0.0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for start in range(0, len(y_vals), _CORR_BLOCK_ROWS):
+            block = A[start : start + _CORR_BLOCK_ROWS]
+            if shift_x is None:
+                shift_x = np.nan_to_num(np.nanmean(block, axis=0))
+            xb = block - shift_x
+            yb = y_vals[start : start + _CORR_BLOCK_ROWS] - shift_y
+            present = ~np.isnan(xb)
+            if not present.all():
+                xb = np.where(present, xb, 0.0)
+            weight = present.astype(np.float64)
+            n += weight.sum(axis=0)
+            sx += xb.sum(axis=0)
+            sxx += np.einsum("ij,ij->j", xb, xb)
+            sy += yb @ weight
+            syy += (yb * yb) @ weight
+            sxy += yb @ xb
+        corr = (n * sxy - sx * sy) / np.sqrt((n * sxx - sx * sx) * (n * syy - sy * sy))
+    return np.nan_to_num(corr)
+
+
+def _leaked_columns(X: "pd.DataFrame", y: "pd.Series", corr_threshold: Optional[float]) -> Tuple[List[int], str]:
+    """Positions of columns equal to ``y`` (allclose or exact), else of columns correlated with it."""
+    assert pd is not None
+    numeric = [i for i, dt in enumerate(X.dtypes) if pd.api.types.is_numeric_dtype(dt)]
+    if not pd.api.types.is_numeric_dtype(y.dtype):
+        # Non-numeric target: exact match on fingerprint, verified on collision
+        y_fp = _fingerprint(y)
+        numeric_set = set(numeric)
+        others = [i for i in range(X.shape[1]) if i not in numeric_set]
+        return [i for i in others if _fingerprint(X.iloc[:, i]) == y_fp and X.iloc[:, i].equals(y)], "identical to"
+    if not numeric:
+        return [], ""
+    frame = X if len(numeric) == X.shape[1] else X.iloc[:, numeric]
+    A = frame.to_numpy(dtype=np.float64, na_value=np.nan)
+    y_vals = y.to_numpy(dtype=np.float64, na_value=np.nan)
+    hits = [numeric[j] for j in _allclose_candidates(A, y_vals) if np.allclose(A[:, j], y_vals, equal_nan=True)]
+    if hits:
+        return hits, "identical to"
+    if corr_threshold is not None:
+        flagged = np.flatnonzero(np.abs(_correlations(A, y_vals)) >= corr_threshold)
+        return [numeric[j] for j in flagged], f"correlated (|r| >= {corr_threshold}) with"
+    return [], ""
+
+
+def check_no_target_in_features(
+    X: ArrayLike,
+    y: Optional[ArrayLike],
+    target_name: Optional[str] = None,
+    corr_threshold: Optional[float] = None,
+) -> None:
     """Guard against target leakage by ensuring target is not among features.
 
     If ``target_name`` is provided and X is a DataFrame, verify that column is not present.
-    If y is an array/Series equal to a column in X by identity, raise.
+    If y is a Series with the same index as X and equal (``np.allclose``) to a column, raise.
+    Numeric columns are screened all at once through a random projection
+    fingerprint that every allclose match must pass, and only the surviving
+    candidates are compared in full; other columns are matched by 64-bit hash
+    with exact verification on collisions. With ``corr_threshold``, also raise
+    for numeric columns whose absolute Pearson correlation with y reaches it.
     """
     if target_name and is_dataframe(X):
         assert pd is not None
@@ -26,34 +141,368 @@ def check_no_target_in_features(X: ArrayLike, y: Optional[ArrayLike], target_nam
     if y is not None and is_dataframe(X):
         assert pd is not None
         if isinstance(y, pd.Series):
-            # If indexes and values match a column exactly, warn/raise
-            for col in X.columns:  # type: ignore[attr-defined]
-                s = X[col]
-                if s.index.equals(y.index) and np.allclose(np.asarray(s), np.asarray(y), equal_nan=True):  # type: ignore[arg-type]
-                    raise ValueError(f"Target leakage: y is identical to feature column '{col}'")
+            frame = X.to_frame() if isinstance(X, pd.Series) else X
+            if len(frame.columns) == 0 or not frame.index.equals(y.index):
+                return
+            hits, relation = _leaked_columns(frame, y, corr_threshold)
+            if hits:
+                col = frame.columns[min(hits)]
+                raise ValueError(f"Target leakage: y is {relation} feature column '{col}'")
 
 
-def fit_on_train_apply_to_splits(preprocessor: BasePreprocessor, X_train: ArrayLike, X_valid: ArrayLike, y_train: Optional[ArrayLike] = None) -> TrainTransformResult:
+def fit_on_train_apply_to_splits(
+    preprocessor: BasePreprocessor,
+    X_train: ArrayLike,
+    X_valid: ArrayLike,
+    y_train: Optional[ArrayLike] = None,
+    cache: Optional[FitCache] = None,
+) -> TrainTransformResult:
     """Fit preprocessor on training split only and apply to both splits.
 
     This enforces the no-leakage rule during cross-validation or holdout evaluation.
+    With a ``cache``, a fit on identical training data and parameters is reused
+    instead of recomputed.
     """
-    preprocessor.fit(X_train, y_train)
+    if cache is not None:
+        cache.fit(preprocessor, X_train, y_train)
+    else:
+        preprocessor.fit(X_train, y_train)
     Xtr = preprocessor.transform(X_train)
     Xva = preprocessor.transform(X_valid)
     return TrainTransformResult(X_train=Xtr, X_valid=Xva, preprocessor=preprocessor)
 
 
-def assert_disjoint_indices(a: ArrayLike, b: ArrayLike) -> None:
-    """Ensure two DataFrame indices (if present) are disjoint to prevent leakage across splits."""
-    if is_dataframe(a) and is_dataframe(b):
+@dataclass
+class OverlapReport:
+    """IDs shared by two splits: distinct count and a few examples.
+
+    ``exact`` is False when the search stopped at the first block of probed
+    IDs that overlapped, in which case ``count`` is a lower bound.
+    """
+
+    count: int
+    examples: List[Any]
+    exact: bool = True
+
+
+# IDs probed per block when stopping at the first overlap
+_PROBE_BLOCK = 1 << 20
+
+
+def _split_ids(x: Any, on: Optional[str] = None) -> Optional[np.ndarray]:
+    """IDs of a split: a DataFrame column ``on`` or the index, or a 1-D array/list/Index.
+
+    Missing IDs (NaN/None/NaT) are dropped. Returns None for 2-D arrays,
+    which carry no row identity.
+    """
+    if is_dataframe(x):
         assert pd is not None
-        ia = a.index if hasattr(a, "index") else None
-        ib = b.index if hasattr(b, "index") else None
-        if ia is not None and ib is not None:
-            inter = ia.intersection(ib)
-            if len(inter) > 0:
-                raise ValueError("Data leakage: training and validation indices overlap")
+        if on is not None:
+            if isinstance(x, pd.Series) or on not in x.columns:
+                raise KeyError(f"ID column '{on}' not found")
+            return _present_ids(x[on].to_numpy())
+        return _present_ids(x.index.to_numpy())
+    if pd is not None and isinstance(x, pd.Index):
+        return _present_ids(x.to_numpy())
+    arr = np.asarray(x)
+    if arr.ndim == 0:
+        raise TypeError("Split IDs must be one-dimensional")
+    return _present_ids(arr) if arr.ndim == 1 else None
+
+
+def _present_ids(ids: np.ndarray) -> np.ndarray:
+    if ids.dtype.kind in "iub":  # cannot hold missing values
+        return ids
+    missing = pd.isna(ids) if pd is not None else ids != ids
+    return ids[~missing] if missing.any() else ids
+
+
+def _distinct(values: np.ndarray) -> np.ndarray:
+    return pd.unique(values) if pd is not None else np.unique(values)
+
+
+def _dense_range(parts: Sequence[np.ndarray]) -> Optional[Tuple[int, int]]:
+    """``(lo, hi)`` when all IDs are integers spanning a range small enough for a lookup table.
+
+    The table is allowed about as many bytes as the IDs themselves occupy.
+    """
+    parts = [part for part in parts if len(part)]
+    if not parts or any(part.dtype.kind not in "iu" for part in parts):
+        return None
+    lo = min(int(part.min()) for part in parts)
+    hi = max(int(part.max()) for part in parts)
+    return (lo, hi) if hi - lo < 8 * sum(len(part) for part in parts) else None
+
+
+def _shared_lookup(ref: np.ndarray, dense: Optional[Tuple[int, int]]) -> Callable[[np.ndarray], np.ndarray]:
+    """Index ``ref`` once; the result maps a probe block to its elements present in ``ref``."""
+    if dense is not None:
+        lo, hi = dense
+        table = np.zeros(hi - lo + 1, dtype=bool)
+        table[ref - lo] = True
+        return lambda probe: probe[table[probe - lo]]
+    if ref.dtype.kind in "iu":
+        # Sparse integer IDs: sorted merge of the sorted block against the sorted reference
+        ref_sorted = np.sort(ref)
+        last = len(ref_sorted) - 1
+
+        def merge(probe: np.ndarray) -> np.ndarray:
+            probe = np.sort(probe)
+            return probe[ref_sorted[np.minimum(np.searchsorted(ref_sorted, probe), last)] == probe]
+
+        return merge
+    if pd is None:  # pragma: no cover
+        return lambda probe: probe[np.isin(probe, ref)]
+    # Any other hashable IDs: hash-table probing
+    table_index = pd.Index(_distinct(ref))
+    return lambda probe: probe[table_index.get_indexer(probe) >= 0]
+
+
+def _overlap(a_ids: np.ndarray, b_ids: np.ndarray, max_examples: int, stop_early: bool) -> OverlapReport:
+    """Shared IDs of two splits; with ``stop_early`` return at the first overlapping probe block."""
+    # Index the smaller split and stream the larger one through the lookup
+    probe, ref = (a_ids, b_ids) if len(a_ids) >= len(b_ids) else (b_ids, a_ids)
+    if not len(ref):
+        return OverlapReport(0, [])
+    dense = _dense_range([probe, ref])
+    if probe.dtype.kind in "iu" and ref.dtype.kind in "iu" and (probe.max() < ref.min() or probe.min() > ref.max()):
+        return OverlapReport(0, [])  # disjoint ID ranges, e.g. time-ordered splits
+    lookup = _shared_lookup(ref, dense)
+    step = _PROBE_BLOCK if stop_early else len(probe)
+    for start in range(0, len(probe), step):
+        found = lookup(probe[start : start + step])
+        if len(found):
+            shared = _distinct(found)
+            return OverlapReport(len(shared), shared[:max_examples].tolist(), exact=start + step >= len(probe))
+    return OverlapReport(0, [])
+
+
+def find_overlap(a: Any, b: Any, on: Optional[str] = None, max_examples: int = 5) -> OverlapReport:
+    """Count the IDs shared by two splits (see ``assert_disjoint_indices`` for accepted inputs).
+
+    Missing IDs (NaN/None) are ignored.
+    """
+    a_ids, b_ids = _split_ids(a, on), _split_ids(b, on)
+    if a_ids is None or b_ids is None:
+        raise TypeError("Splits must be DataFrames/Series, an Index or 1-D ID arrays")
+    return _overlap(a_ids, b_ids, max_examples, stop_early=False)
+
+
+def assert_disjoint_indices(a: Any, b: Any, on: Optional[str] = None, max_examples: int = 5) -> None:
+    """Ensure two splits share no row or group IDs to prevent leakage across splits.
+
+    IDs are the index of a DataFrame/Series (or its column ``on``, e.g. a
+    student or session ID), a pandas Index, or a 1-D array or list of
+    integer or hashable IDs. 2-D arrays carry no IDs and are not checked;
+    missing IDs (NaN/None) are ignored.
+    The check stops at the first block of IDs that overlaps.
+    """
+    a_ids, b_ids = _split_ids(a, on), _split_ids(b, on)
+    if a_ids is None or b_ids is None:
+        return
+    report = _overlap(a_ids, b_ids, max_examples, stop_early=True)
+    if report.count:
+        bound = "" if report.exact else "at least "
+        raise ValueError(
+            "Data leakage: training and validation indices overlap "
+            f"({bound}{report.count} shared IDs, e.g. {report.examples})"
+        )
+
+
+def find_split_overlaps(
+    splits: Sequence[Any], on: Optional[str] = None, max_examples: int = 5
+) -> Dict[Tuple[int, int], OverlapReport]:
+    """Overlaps between every pair of ``splits``, keyed by ``(i, j)`` with ``i < j``.
+
+    Dense integer IDs are checked in one pass against a table recording
+    which split owns each ID. Otherwise, or to describe overlaps once found,
+    all IDs are factorized together once instead of running K*(K-1)/2
+    pairwise checks. Missing IDs (NaN/None) are ignored. Only overlapping
+    pairs are returned.
+    """
+    assert pd is not None
+    ids = [_split_ids(split, on) for split in splits]
+    if any(part is None for part in ids):
+        raise TypeError("Splits must be DataFrames/Series, an Index or 1-D ID arrays")
+    k = len(ids)
+    if k < 2:
+        return {}
+    dense = _dense_range(ids)
+    if dense is not None:
+        # Fast path for integer IDs: one owner table, stop at the first ID already owned
+        owner = np.full(dense[1] - dense[0] + 1, -1, dtype=np.int32)
+        for label, part in enumerate(ids):
+            slots = part - dense[0]
+            if (owner[slots] >= 0).any():
+                break
+            owner[slots] = label
+        else:
+            return {}
+    labels = np.repeat(np.arange(k), [len(part) for part in ids])
+    codes, uniques = pd.factorize(np.concatenate(ids))
+    present = codes >= 0
+    codes, labels = codes[present], labels[present]
+    first = np.full(len(uniques), k)
+    last = np.full(len(uniques), -1)
+    np.minimum.at(first, codes, labels)
+    np.maximum.at(last, codes, labels)
+    shared = np.flatnonzero(first != last)
+    if not shared.size:
+        return {}
+    # Which splits hold each shared ID
+    position = np.full(len(uniques), -1)
+    position[shared] = np.arange(shared.size)
+    rows = position[codes] >= 0
+    member = np.zeros((shared.size, k), dtype=bool)
+    member[position[codes[rows]], labels[rows]] = True
+    reports: Dict[Tuple[int, int], OverlapReport] = {}
+    for i in range(k):
+        for j in range(i + 1, k):
+            both = np.flatnonzero(member[:, i] & member[:, j])
+            if both.size:
+                examples = np.asarray(uniques)[shared[both[:max_examples]]].tolist()
+                reports[(i, j)] = OverlapReport(int(both.size), examples)
+    return reports
+
+
+def assert_disjoint_splits(splits: Sequence[Any], on: Optional[str] = None, max_examples: int = 5) -> None:
+    """Ensure no ID appears in more than one of ``splits`` (all pairs checked in one pass)."""
+    reports = find_split_overlaps(splits, on, max_examples)
+    if reports:
+        details = "; ".join(
+            f"splits {i} and {j} share {r.count} IDs (e.g. {r.examples})" for (i, j), r in sorted(reports.items())
+        )
+        raise ValueError(f"Data leakage: {details}")
+
+
+Fold = Union[np.ndarray, Sequence[int], Tuple[Any, Any]]
+
+
+def _as_positions(part: Any, n: int) -> np.ndarray:
+    arr = np.asarray(part)
+    if arr.dtype == bool:
+        if arr.shape != (n,):
+            raise ValueError(f"Boolean fold mask must have shape ({n},)")
+        return np.flatnonzero(arr)
+    if arr.size == 0:
+        return np.empty(0, dtype=np.intp)
+    if arr.ndim != 1 or arr.dtype.kind not in "iu":
+        raise TypeError("Folds must be 1-D integer positions or boolean masks")
+    if arr.min() < 0 or arr.max() >= n:
+        raise ValueError(f"Fold positions must lie in [0, {n})")
+    return arr.astype(np.intp, copy=False)
+
+
+def _fold_positions(fold: Fold, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """``(train, valid)`` positions; a bare fold is the validation rows and trains on the rest."""
+    if isinstance(fold, tuple) and len(fold) == 2:
+        return _as_positions(fold[0], n), _as_positions(fold[1], n)
+    valid = _as_positions(fold, n)
+    train = np.ones(n, dtype=bool)
+    train[valid] = False
+    return np.flatnonzero(train), valid
+
+
+def _take_rows(X: Any, positions: np.ndarray) -> Any:
+    if X is None:
+        return None
+    return X.iloc[positions] if is_dataframe(X) else np.asarray(X)[positions]
+
+
+def _fit_fold(
+    preprocessor: BasePreprocessor, X_train: Any, X_valid: Any, y_train: Any
+) -> TrainTransformResult:  # runs in worker processes
+    return fit_on_train_apply_to_splits(preprocessor, X_train, X_valid, y_train)
+
+
+def _complement_fits(
+    preprocessor: BasePreprocessor, X: Any, splits: List[Tuple[np.ndarray, np.ndarray]]
+) -> Optional[List[BasePreprocessor]]:
+    """Fit every fold's training complement from per-block sufficient statistics.
+
+    Returns None unless the preprocessor exposes mergeable statistics, every
+    fold trains on exactly the rows outside its validation set and the
+    validation sets are disjoint. Rows are then read once, one block per
+    fold plus the rows in no validation set, and each complement fit merges
+    the statistics of the other blocks.
+    """
+    n = len(X)
+    if any(len(train) + len(valid) != n for train, valid in splits):
+        return None
+    valids = [valid for _, valid in splits]
+    coverage = np.bincount(np.concatenate(valids), minlength=n) if valids else np.zeros(n, dtype=np.intp)
+    if coverage.max(initial=0) > 1:
+        return None  # overlapping validation sets do not partition the rows
+    X_np = _to_numpy_2d(X)
+    blocks = [*valids, np.flatnonzero(coverage == 0)]
+    stats: List[Any] = []
+    for pos in blocks:
+        block_stats = preprocessor._sufficient_stats(X_np[pos]) if len(pos) else None
+        if len(pos) and block_stats is None:
+            return None
+        stats.append(block_stats)
+    columns = get_columns(X)
+    fitted = []
+    for k, (train, _) in enumerate(splits):
+        others = [st for j, st in enumerate(stats) if j != k and st is not None]
+        if not others:
+            raise ValueError(f"Fold {k} leaves no training rows")
+        merged = others[0]
+        for st in others[1:]:
+            merged = preprocessor._merge_stats(merged, st)
+        clone = copy.deepcopy(preprocessor)
+        clone._fit_from_stats(merged, len(train), columns, X_np[:0])
+        fitted.append(clone)
+    return fitted
+
+
+def cross_fit_transform(
+    preprocessor: BasePreprocessor,
+    X: ArrayLike,
+    folds: Sequence[Fold],
+    y: Optional[ArrayLike] = None,
+    n_jobs: Optional[int] = None,
+) -> List[TrainTransformResult]:
+    """Fit a copy of ``preprocessor`` per fold on its training rows and transform both splits.
+
+    Each fold is either the validation rows (the fold trains on all other
+    rows) or a ``(train, valid)`` pair, given as integer positions or boolean
+    masks. Every fold is checked with ``assert_disjoint_indices`` on its
+    positions and, for DataFrames, on its index labels.
+
+    Preprocessors with mergeable statistics (``StandardScaler`` without
+    outlier detection, ``MinMaxScaler``) fit all folds from a single pass when
+    the validation sets are disjoint and each fold trains on its complement.
+    Otherwise each fold is fitted from scratch, serially unless ``n_jobs`` > 1
+    asks for a process pool (worth it only for expensive fits, and the
+    preprocessor and data must be picklable).
+    """
+    n = len(X)
+    splits = [_fold_positions(fold, n) for fold in folds]
+    for train, valid in splits:
+        assert_disjoint_indices(train, valid)
+        if is_dataframe(X):
+            assert_disjoint_indices(X.index[train], X.index[valid])  # type: ignore[union-attr]
+
+    fitted = _complement_fits(preprocessor, X, splits) if preprocessor._supports_numpy and splits else None
+    if fitted is not None:
+        return [
+            TrainTransformResult(
+                X_train=model.transform(_take_rows(X, train)),
+                X_valid=model.transform(_take_rows(X, valid)),
+                preprocessor=model,
+            )
+            for model, (train, valid) in zip(fitted, splits)
+        ]
+
+    tasks = [
+        (copy.deepcopy(preprocessor), _take_rows(X, train), _take_rows(X, valid), _take_rows(y, train))
+        for train, valid in splits
+    ]
+    if n_jobs is None or n_jobs <= 1 or len(tasks) <= 1:
+        return [_fit_fold(*task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=min(n_jobs, len(tasks))) as pool:
+        return list(pool.map(_fit_fold, *zip(*tasks)))
 
 
 @dataclass
@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import importlib
+import inspect
+import json
+import os
+import struct
+from typing import Any, Dict, List, Type, Union
+
+import numpy as np
+
+from .core import BasePreprocessor
+from .sketches import HyperLogLog, KLLSketch
+
+try:
+    import pandas as pd  # type: ignore
+except Exception:  # pragma: no cover - pandas optional
+    pd = None  # type: ignore
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+# File layout: magic, little-endian uint64 header length, UTF-8 JSON header,
+# then raw C-ordered array buffers, each starting on an _ALIGN-byte boundary
+# so they can be viewed in place from a memory map.
+_MAGIC = b"\x93PREPROC"
+_LENGTH = struct.Struct("<Q")
+_ALIGN = 64
+FORMAT_VERSION = 1
+
+# Plain (non-preprocessor) classes allowed inside a saved state
+_PLAIN_CLASSES: Dict[str, type] = {
+    f"{cls.__module__}:{cls.__qualname__}": cls for cls in (KLLSketch, HyperLogLog)
+}
+
+
+def _class_path(cls: type) -> str:
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def _resolve_preprocessor(path: str) -> Type[BasePreprocessor]:
+    module, _, qualname = path.partition(":")
+    obj: Any = importlib.import_module(module)
+    for part in qualname.split("."):
+        obj = getattr(obj, part)
+    if not (isinstance(obj, type) and issubclass(obj, BasePreprocessor)):
+        raise TypeError(f"{path} is not a BasePreprocessor subclass")
+    return obj
+
+
+def _init_params(obj: BasePreprocessor) -> List[str]:
+    params = inspect.signature(type(obj).__init__).parameters.values()
+    names = [p.name for p in params if p.kind in (p.POSITIONAL_OR_KEYWORD, p.KEYWORD_ONLY) and p.name != "self"]
+    missing = [name for name in names if not hasattr(obj, name)]
+    if missing:
+        raise TypeError(f"{type(obj).__name__} does not store constructor parameters {missing} as attributes")
+    return names
+
+
+def _fitted_attributes(obj: BasePreprocessor) -> Dict[str, Any]:
+    """``is_fitted`` plus every public attribute with a trailing underscore."""
+    state = {"is_fitted": obj.is_fitted}
+    state.update({k: v for k, v in vars(obj).items() if k.endswith("_") and not k.startswith("_")})
+    return state
+
+
+class _Encoder:
+    """Turns an object graph into a JSON-able tree plus a list of array buffers.
+
+    With ``include_state=False`` preprocessors are described by class and
+    parameters only, which identifies what ``fit`` would produce.
+    """
+
+    def __init__(self, include_state: bool = True) -> None:
+        self.arrays: List[np.ndarray] = []
+        self.include_state = include_state
+
+    def _buffer(self, arr: np.ndarray) -> int:
+        self.arrays.append(arr if arr.flags.c_contiguous else arr.copy(order="C"))
+        return len(self.arrays) - 1
+
+    def encode(self, value: Any) -> Any:
+        if value is None or isinstance(value, (bool, int, float, str)) and not isinstance(value, np.generic):
+            return value
+        if isinstance(value, BasePreprocessor):
+            node = {
+                "__preprocessor__": _class_path(type(value)),
+                "params": {name: self.encode(getattr(value, name)) for name in _init_params(value)},
+            }
+            if self.include_state:
+                node["state"] = {name: self.encode(v) for name, v in _fitted_attributes(value).items()}
+            return node
+        if isinstance(value, np.ndarray):
+            if value.dtype == object:
+                return {"__objarray__": [self.encode(v) for v in value.ravel().tolist()], "shape": list(value.shape)}
+            return {"__ndarray__": self._buffer(value)}
+        if isinstance(value, np.generic):
+            return {"__scalar__": self._buffer(np.asarray(value))}
+        if isinstance(value, np.dtype):
+            return {"__dtype__": value.str}
+        if isinstance(value, list):
+            return [self.encode(v) for v in value]
+        if isinstance(value, tuple):
+            return {"__tuple__": [self.encode(v) for v in value]}
+        if isinstance(value, dict):
+            return {"__dict__": [[self.encode(k), self.encode(v)] for k, v in value.items()]}
+        if isinstance(value, slice):
+            return {"__slice__": [value.start, value.stop, value.step]}
+        if _class_path(type(value)) in _PLAIN_CLASSES:
+            return {"__object__": _class_path(type(value)), "state": self.encode(dict(vars(value)))}
+        if pd is not None:
+            if value is pd.NaT:
+                return {"__nat__": True}
+            if isinstance(value, pd.Timestamp):
+                return {"__timestamp__": [value.value, str(value.tz) if value.tz is not None else None]}
+            if isinstance(value, pd.Index):
+                return self._encode_index(value)
+            if isinstance(value, pd.DataFrame):
+                return {
+                    "__dataframe__": {
+                        "columns": self.encode(list(value.columns)),
+                        "index": self._encode_index(value.index),
+                        "data": [self._encode_values(value.iloc[:, i]) for i in range(value.shape[1])],
+                    }
+                }
+        raise TypeError(f"Cannot save value of type {type(value).__name__}")
+
+    def _encode_values(self, values: Any) -> Any:
+        if isinstance(values.dtype, np.dtype) and values.dtype != object:
+            return self.encode(values.to_numpy())
+        # Extension and object dtypes (strings, categoricals, tz-aware datetimes) go element-wise
+        elements = np.asarray(values.astype(object), dtype=object)
+        return {"__values__": self.encode(elements), "dtype": str(values.dtype)}
+
+    def _encode_index(self, index: "pd.Index") -> Dict[str, Any]:
+        if isinstance(index, pd.RangeIndex):
+            return {"__range_index__": [index.start, index.stop, index.step], "name": self.encode(index.name)}
+        return {"__index__": self._encode_values(index), "name": self.encode(index.name)}
+
+
+def _decode(node: Any, arrays: List[np.ndarray]) -> Any:
+    if isinstance(node, list):
+        return [_decode(v, arrays) for v in node]
+    if not isinstance(node, dict):
+        return node
+    if "__ndarray__" in node:
+        return arrays[node["__ndarray__"]]
+    if "__preprocessor__" in node:
+        cls = _resolve_preprocessor(node["__preprocessor__"])
+        obj = cls(**{name: _decode(v, arrays) for name, v in node["params"].items()})
+        for name, v in node["state"].items():
+            setattr(obj, name, _decode(v, arrays))
+        obj._after_load()
+        return obj
+    if "__dict__" in node:
+        return {_decode(k, arrays): _decode(v, arrays) for k, v in node["__dict__"]}
+    if "__tuple__" in node:
+        return tuple(_decode(v, arrays) for v in node["__tuple__"])
+    if "__objarray__" in node:
+        out = np.empty(len(node["__objarray__"]), dtype=object)
+        out[:] = [_decode(v, arrays) for v in node["__objarray__"]]
+        return out.reshape(node["shape"])
+    if "__scalar__" in node:
+        return arrays[node["__scalar__"]][()]
+    if "__dtype__" in node:
+        return np.dtype(node["__dtype__"])
+    if "__slice__" in node:
+        return slice(*node["__slice__"])
+    if "__object__" in node:
+        cls = _PLAIN_CLASSES.get(node["__object__"])
+        if cls is None:
+            raise TypeError(f"Refusing to load object of class {node['__object__']}")
+        obj = cls.__new__(cls)
+        obj.__dict__.update(_decode(node["state"], arrays))
+        return obj
+    if pd is None:
+        raise RuntimeError("pandas is required to load this file")
+    if "__nat__" in node:
+        return pd.NaT
+    if "__timestamp__" in node:
+        value, tz = node["__timestamp__"]
+        return pd.Timestamp(value, tz="UTC").tz_convert(tz) if tz else pd.Timestamp(value)
+    if "__values__" in node:
+        return pd.array(_decode(node["__values__"], arrays), dtype=node["dtype"])
+    if "__range_index__" in node:
+        return pd.RangeIndex(*node["__range_index__"], name=_decode(node["name"], arrays))
+    if "__index__" in node:
+        return pd.Index(_decode(node["__index__"], arrays), name=_decode(node["name"], arrays))
+    if "__dataframe__" in node:
+        spec = node["__dataframe__"]
+        data = [_decode(v, arrays) for v in spec["data"]]
+        df = pd.DataFrame(dict(enumerate(data)), index=_decode(spec["index"], arrays))
+        df.columns = pd.Index(_decode(spec["columns"], arrays))
+        return df
+    raise ValueError(f"Unrecognized node in saved state: {sorted(node)}")
+
+
+def _aligned(n: int) -> int:
+    return -(-n // _ALIGN) * _ALIGN
+
+
+def save(obj: BasePreprocessor, path: PathLike) -> None:
+    """Write a preprocessor (fitted or not) to ``path`` in the binary state format.
+
+    The JSON header records the class, its constructor parameters, the fitted
+    (trailing-underscore) attributes and the format version; arrays are
+    stored as raw aligned buffers after it. Nested preprocessors (pipeline
+    steps, column-transformer branches) are saved recursively. The file is
+    written to a temporary name and renamed, so readers never see a partial
+    file.
+    """
+    if not isinstance(obj, BasePreprocessor):
+        raise TypeError("save expects a BasePreprocessor")
+    encoder = _Encoder()
+    root = encoder.encode(obj)
+    buffers, offset = [], 0
+    for arr in encoder.arrays:
+        buffers.append({"dtype": arr.dtype.str, "shape": list(arr.shape), "offset": offset})
+        offset = _aligned(offset + arr.nbytes)
+    header = json.dumps({"format_version": FORMAT_VERSION, "root": root, "buffers": buffers}).encode("utf-8")
+    data_start = _aligned(len(_MAGIC) + _LENGTH.size + len(header))
+
+    tmp = f"{os.fspath(path)}.tmp{os.getpid()}"
+    try:
+        with open(tmp, "wb") as fh:
+            fh.write(_MAGIC + _LENGTH.pack(len(header)) + header)
+            for arr, buf in zip(encoder.arrays, buffers):
+                fh.seek(data_start + buf["offset"])
+                fh.write(arr.reshape(-1).view(np.uint8).data)
+            fh.truncate(data_start + offset)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def load(path: PathLike, mmap: bool = True) -> BasePreprocessor:
+    """Read a preprocessor written by ``save``.
+
+    With ``mmap=True`` fitted arrays are views into a copy-on-write memory
+    map of the file: nothing is read until it is touched, processes mapping
+    the same file share its pages, and in-place updates stay private to the
+    process. With ``mmap=False`` the file is read into memory once. Class
+    names in the header are imported, so only load files you trust.
+    """
+    with open(path, "rb") as fh:
+        prefix = fh.read(len(_MAGIC) + _LENGTH.size)
+        if prefix[: len(_MAGIC)] != _MAGIC:
+            raise ValueError(f"{os.fspath(path)} is not a saved preprocessor")
+        (header_len,) = _LENGTH.unpack(prefix[len(_MAGIC):])
+        header = json.loads(fh.read(header_len).decode("utf-8"))
+        if header.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported preprocessor format version {header.get('format_version')}")
+        data_start = _aligned(len(prefix) + header_len)
+        if not header["buffers"]:
+            raw: Any = None
+        elif mmap:
+            raw = np.memmap(fh, dtype=np.uint8, mode="c")
+        else:
+            fh.seek(0)
+            raw = bytearray(fh.read())
+    arrays = [_view(raw, data_start + buf["offset"], buf) for buf in header["buffers"]]
+    obj = _decode(header["root"], arrays)
+    if not isinstance(obj, BasePreprocessor):
+        raise TypeError("Saved root object is not a preprocessor")
+    return obj
+
+
+def _view(raw: Any, offset: int, buf: Dict[str, Any]) -> np.ndarray:
+    dtype, shape = np.dtype(buf["dtype"]), tuple(buf["shape"])
+    if dtype.itemsize * int(np.prod(shape, dtype=np.int64)) == 0:
+        return np.empty(shape, dtype=dtype)
+    return np.ndarray(shape, dtype=dtype, buffer=raw, offset=offset)
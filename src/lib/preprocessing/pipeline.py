@@ -0,0 +1,337 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+import os
+
+import numpy as np
+
+from .core import ArrayLike, BasePreprocessor, get_columns, is_dataframe
+from .scalers import _from_numpy_like, _to_numpy_2d
+
+try:
+    import pandas as pd  # type: ignore
+except Exception:  # pragma: no cover - pandas optional
+    pd = None  # type: ignore
+
+
+# A fitted stage is either a preprocessor or a fused affine block ``X * a + b``.
+_Stage = Union[BasePreprocessor, Tuple[np.ndarray, np.ndarray]]
+
+
+class Pipeline(BasePreprocessor):
+    """Chain preprocessors, passing bare ndarrays between numeric stages.
+
+    Stages that support the array-level hooks (``_supports_numpy``) never see a
+    DataFrame: the input is converted once and the result is wrapped back into
+    pandas at most once, at the end. Runs of adjacent affine stages (scalers
+    without clipping) are folded at fit time into a single multiply-add.
+    DataFrame-only stages such as ``OneHotEncoder`` still receive a DataFrame.
+    """
+
+    def __init__(self, steps: Sequence[Tuple[str, BasePreprocessor]], fuse_affine: bool = True) -> None:
+        super().__init__()
+        names = [name for name, _ in steps]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Pipeline step names must be unique, got {names}")
+        self.steps = list(steps)
+        self.fuse_affine = fuse_affine
+        self._supports_numpy = all(step._supports_numpy for _, step in self.steps)
+        self._stages: List[_Stage] = []
+
+    @property
+    def named_steps(self) -> Dict[str, BasePreprocessor]:
+        return dict(self.steps)
+
+    def fit(self, X: ArrayLike, y: Optional[ArrayLike] = None) -> "Pipeline":
+        self._run(X, y, fit=True, transform_last=False)
+        return self
+
+    def fit_transform(self, X: ArrayLike, y: Optional[ArrayLike] = None) -> ArrayLike:
+        return self._run(X, y, fit=True, transform_last=True)
+
+    def transform(self, X: ArrayLike) -> ArrayLike:
+        if not self.is_fitted:
+            raise RuntimeError("Pipeline must be fitted before calling transform().")
+        return self._run(X, None, fit=False, transform_last=True)
+
+    def inverse_transform(self, X: ArrayLike) -> ArrayLike:
+        if not self.is_fitted:
+            raise RuntimeError("Pipeline must be fitted before calling inverse_transform().")
+        return _from_numpy_like(X, self._inverse_transform_numpy(_to_numpy_2d(X)))
+
+    def _transform_numpy(self, X_np: np.ndarray) -> np.ndarray:
+        for stage in self._stages:
+            X_np = _apply_numpy(stage, X_np)
+        return X_np
+
+    def _inverse_transform_numpy(self, X_np: np.ndarray) -> np.ndarray:
+        if not self._supports_numpy:
+            raise TypeError("inverse_transform requires every pipeline step to be array-invertible")
+        for _, step in reversed(self.steps):
+            X_np = step._inverse_transform_numpy(X_np)
+        return X_np
+
+    def _after_load(self) -> None:
+        if self.is_fitted:
+            self._stages = self._build_stages()
+
+    def _affine_params(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        if len(self._stages) == 1:
+            stage = self._stages[0]
+            return stage if isinstance(stage, tuple) else stage._affine_params()
+        return None
+
+    # ----- Internals -----
+    def _build_stages(self) -> List[_Stage]:
+        """Group fitted steps, folding runs of affine steps into one ``(a, b)`` pair."""
+        stages: List[_Stage] = []
+        run: List[Tuple[np.ndarray, np.ndarray]] = []
+        run_steps: List[BasePreprocessor] = []
+
+        def flush() -> None:
+            if len(run) == 1:
+                stages.append(run_steps[0])
+            elif run:
+                a, b = run[0]
+                for a_next, b_next in run[1:]:
+                    # (X * a + b) * a_next + b_next
+                    a, b = a * a_next, b * a_next + b_next
+                stages.append((a, b))
+            run.clear()
+            run_steps.clear()
+
+        for _, step in self.steps:
+            params = step._affine_params() if (self.fuse_affine and step._supports_numpy) else None
+            if params is None:
+                flush()
+                stages.append(step)
+            else:
+                run.append(params)
+                run_steps.append(step)
+        flush()
+        return stages
+
+    def _run(self, X: ArrayLike, y: Optional[ArrayLike], fit: bool, transform_last: bool) -> ArrayLike:
+        names = get_columns(X)
+        index = X.index if is_dataframe(X) else None  # type: ignore[union-attr]
+        frame: Optional[ArrayLike] = X if is_dataframe(X) else None
+        arr: Optional[np.ndarray] = None if frame is not None else _to_numpy_2d(X)
+        rebuilt = False
+
+        stages: Sequence[_Stage] = [step for _, step in self.steps] if fit else self._stages
+        for i, stage in enumerate(stages):
+            last = i == len(stages) - 1
+            if isinstance(stage, tuple) or stage._supports_numpy:
+                if arr is None:
+                    arr = _to_numpy_2d(frame)  # type: ignore[arg-type]
+                    frame = None
+                if fit:
+                    assert not isinstance(stage, tuple)
+                    stage.fit(arr, y)
+                    if names is not None and stage.feature_names_in_ is None:
+                        stage.feature_names_in_ = list(names)
+                        stage.feature_names_out_ = list(names)
+                if last and not transform_last:
+                    break
+                arr = _apply_numpy(stage, arr)
+                continue
+
+            if frame is None:
+                if names is not None and index is not None:
+                    assert pd is not None
+                    frame = pd.DataFrame(arr, index=index, columns=names)
+                    rebuilt = True
+                else:
+                    frame = arr
+                arr = None
+            if fit:
+                stage.fit(frame, y)
+            if last and not transform_last:
+                break
+            out = stage.transform(frame)
+            if is_dataframe(out):
+                frame, names, index = out, get_columns(out), out.index  # type: ignore[union-attr]
+                rebuilt = True
+            else:
+                arr, frame = _to_numpy_2d(out), None
+                # The array's columns are the stage's outputs, not the frame's columns
+                step_names = stage.feature_names_out_
+                names = list(step_names) if step_names is not None and len(step_names) == arr.shape[1] else None
+                rebuilt = True
+
+        if fit:
+            self.feature_names_in_ = get_columns(X)
+            last_step = self.steps[-1][1] if self.steps else None
+            if last_step is not None and last_step.feature_names_out_ is not None:
+                self.feature_names_out_ = list(last_step.feature_names_out_)
+            else:
+                self.feature_names_out_ = names
+            self._stages = self._build_stages()
+            self.is_fitted = True
+            if not transform_last:
+                return X
+
+        if arr is None:
+            return frame  # type: ignore[return-value]
+        if index is None:
+            return arr
+        n_in = X.shape[1] if X.ndim == 2 else 1  # type: ignore[union-attr]
+        if not rebuilt and arr.shape[1] == n_in:
+            return _from_numpy_like(X, arr)
+        assert pd is not None
+        return pd.DataFrame(arr, index=index, columns=names)
+
+
+class ColumnTransformer(BasePreprocessor):
+    """Apply a preprocessor to each column group and concatenate the results.
+
+    ``transformers`` is a sequence of ``(name, preprocessor, columns)`` where
+    columns are names (DataFrame input) or integer positions (ndarray input).
+    Branches are fitted and transformed concurrently in a thread pool (NumPy
+    releases the GIL for most of the work) and their outputs are copied into
+    slices of a single output matrix, whose dtype is promoted from the actual
+    branch outputs of each call (an integer branch that yields NaN on missing
+    input widens the output to float). ``remainder`` controls
+    columns not claimed by any branch: ``"drop"`` or ``"passthrough"``.
+    """
+
+    def __init__(
+        self,
+        transformers: Sequence[Tuple[str, BasePreprocessor, Union[Sequence[str], Sequence[int]]]],
+        remainder: str = "drop",
+        n_jobs: Optional[int] = None,
+    ) -> None:
+        super().__init__()
+        if remainder not in ("drop", "passthrough"):
+            raise ValueError("remainder must be 'drop' or 'passthrough'")
+        names = [name for name, _, _ in transformers]
+        if len(set(names)) != len(names):
+            raise ValueError(f"ColumnTransformer names must be unique, got {names}")
+        self.transformers = [(name, step, list(cols)) for name, step, cols in transformers]
+        self.remainder = remainder
+        self.n_jobs = n_jobs
+        self.remainder_columns_: Optional[list] = None
+        self.output_slices_: Optional[Dict[str, slice]] = None
+
+    @property
+    def named_transformers(self) -> Dict[str, BasePreprocessor]:
+        return {name: step for name, step, _ in self.transformers}
+
+    def fit(self, X: ArrayLike, y: Optional[ArrayLike] = None) -> "ColumnTransformer":
+        self.feature_names_in_ = get_columns(X)
+        all_cols = list(self.feature_names_in_) if self.feature_names_in_ is not None else list(range(_n_columns(X)))
+        used = {c for _, _, cols in self.transformers for c in cols}
+        missing = [c for c in used if c not in all_cols]
+        if missing:
+            raise KeyError(f"Columns not found for ColumnTransformer: {missing}")
+        self.remainder_columns_ = [c for c in all_cols if c not in used] if self.remainder == "passthrough" else []
+
+        self._map(lambda step, cols: step.fit(_select(X, cols, step._supports_numpy), y))
+
+        # Probe a single row per branch to learn output widths and names. DataFrame
+        # steps that declare their output names are not probed: a row cut out of
+        # the training data is not valid input for every step (TemporalAggregates).
+        names_out: List[str] = []
+        slices: Dict[str, slice] = {}
+        start = 0
+        head = X.iloc[:1] if is_dataframe(X) else _to_numpy_2d(X)[:1]  # type: ignore[union-attr]
+        for name, step, cols in self._branches():
+            if step is not None and not step._supports_numpy and step.feature_names_out_ is not None:
+                cols_out: Optional[list] = list(step.feature_names_out_)
+                width = len(step.feature_names_out_)
+            else:
+                probe = _transform_branch(step, head, cols) if step is not None else _select(head, cols, False)
+                width = _to_numpy_2d(probe).shape[1]
+                cols_out = get_columns(probe)
+            slices[name] = slice(start, start + width)
+            start += width
+            if cols_out is None and step is not None and step.feature_names_out_ is not None:
+                cols_out = list(step.feature_names_out_)
+            if cols_out is None and is_dataframe(X) and width == len(cols):
+                cols_out = cols  # array-level branches map columns one-to-one
+            if cols_out is None or len(cols_out) != width:
+                cols_out = [f"{name}__{i}" for i in range(width)]
+            names_out.extend(str(c) for c in cols_out)
+        if len(set(names_out)) != len(names_out):
+            names_out = [f"{name}__{c}" for name, sl in slices.items() for c in names_out[sl]]
+        self.output_slices_ = slices
+        self.feature_names_out_ = names_out
+        self.is_fitted = True
+        return self
+
+    def transform(self, X: ArrayLike) -> ArrayLike:
+        if not self.is_fitted:
+            raise RuntimeError("ColumnTransformer must be fitted before calling transform().")
+        assert self.output_slices_ is not None and self.feature_names_out_ is not None
+        results: Dict[str, np.ndarray] = {}
+
+        def run(name: str, step: Optional[BasePreprocessor], cols: list) -> None:
+            res = _transform_branch(step, X, cols) if step is not None else _select(X, cols, True)
+            results[name] = _to_numpy_2d(res)
+
+        self._map_branches(run)
+        out = np.empty((len(X), len(self.feature_names_out_)), dtype=_promote(results.values()))  # type: ignore[arg-type]
+        for name, sl in self.output_slices_.items():
+            out[:, sl] = results.pop(name)
+        if is_dataframe(X):
+            assert pd is not None
+            return pd.DataFrame(out, index=X.index, columns=self.feature_names_out_)  # type: ignore[union-attr]
+        return out
+
+    # ----- Internals -----
+    def _branches(self) -> List[Tuple[str, Optional[BasePreprocessor], list]]:
+        branches: List[Tuple[str, Optional[BasePreprocessor], list]] = list(self.transformers)
+        if self.remainder_columns_:
+            branches.append(("remainder", None, self.remainder_columns_))
+        return branches
+
+    def _map(self, fn: Callable[[BasePreprocessor, list], object]) -> None:
+        self._map_branches(lambda _name, step, cols: fn(step, cols) if step is not None else None)
+
+    def _map_branches(self, fn: Callable[[str, Optional[BasePreprocessor], list], object]) -> None:
+        branches = self._branches()
+        n_jobs = self.n_jobs if self.n_jobs is not None else min(len(branches), os.cpu_count() or 1)
+        if n_jobs <= 1 or len(branches) <= 1:
+            for branch in branches:
+                fn(*branch)
+            return
+        with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+            # list() re-raises the first branch exception, if any
+            list(pool.map(lambda branch: fn(*branch), branches))
+
+
+def _promote(arrays: Iterable[np.ndarray]) -> np.dtype:
+    dtypes = [arr.dtype for arr in arrays]
+    if not dtypes:
+        return np.dtype(float)
+    try:
+        return np.result_type(*dtypes)
+    except TypeError:  # e.g. datetimes next to numbers
+        return np.dtype(object)
+
+
+def _n_columns(X: ArrayLike) -> int:
+    return 1 if getattr(X, "ndim", 2) == 1 else int(X.shape[1])  # type: ignore[union-attr]
+
+
+def _select(X: ArrayLike, cols: list, as_numpy: bool) -> ArrayLike:
+    if is_dataframe(X):
+        sub = X[cols]  # type: ignore[index]
+        return _to_numpy_2d(sub) if as_numpy else sub
+    return _to_numpy_2d(X)[:, cols]
+
+
+def _transform_branch(step: BasePreprocessor, X: ArrayLike, cols: list) -> ArrayLike:
+    if step._supports_numpy:
+        return step._transform_numpy(_select(X, cols, True))  # type: ignore[arg-type]
+    return step.transform(_select(X, cols, False))
+
+
+def _apply_numpy(stage: _Stage, X_np: np.ndarray) -> np.ndarray:
+    if isinstance(stage, tuple):
+        a, b = stage
+        out = X_np * a
+        out += b
+        return out
+    return stage._transform_numpy(X_np)
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .schema import ColumnSpec, DType, _observed_dtype
+from .sketches import HyperLogLog, KLLSketch
+
+try:
+    import pandas as pd  # type: ignore
+except Exception:  # pragma: no cover - pandas optional
+    pd = None  # type: ignore
+
+DEFAULT_QUANTILES: Tuple[float, ...] = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+
+@dataclass
+class ColumnProfile:
+    """Summary statistics of one column.
+
+    ``distinct`` and the ``top_values`` counts are exact for a single chunk,
+    or while every value across chunks could be retained (``exact_values``);
+    otherwise ``distinct`` is a HyperLogLog estimate and the counts are lower
+    bounds. Only a bounded number of the most frequent value candidates is
+    kept; ``values`` lists all of them when that is every distinct value.
+    ``quantiles`` (numeric columns only) come from a KLL sketch.
+    """
+
+    name: str
+    dtype: DType
+    count: int = 0
+    null_count: int = 0
+    min: Any = None
+    max: Any = None
+    distinct: float = 0.0
+    exact_values: bool = True
+    top_values: List[Tuple[Any, int]] = field(default_factory=list)
+    values: Optional[List[Any]] = None
+    quantiles: Dict[float, float] = field(default_factory=dict)
+
+    @property
+    def null_rate(self) -> float:
+        return self.null_count / self.count if self.count else 0.0
+
+    def to_column_spec(self, max_enum_size: int = 20) -> ColumnSpec:
+        """Draft a ColumnSpec that accepts the profiled data.
+
+        Numeric and datetime columns get their observed range (datetimes as
+        epoch seconds, rounded outwards so that the float bounds still admit
+        nanosecond-precision extremes). String columns get an enum when all of
+        their values are known exactly and there are at most ``max_enum_size``
+        of them.
+        """
+        spec = ColumnSpec(self.name, self.dtype, allow_nulls=self.null_count > 0)
+        if self.dtype in ("int", "float") and self.min is not None:
+            spec.min, spec.max = float(self.min), float(self.max)
+        elif self.dtype == "datetime" and self.min is not None:
+            spec.min, spec.max = _epoch_seconds(self.min, -np.inf), _epoch_seconds(self.max, np.inf)
+        elif self.dtype == "string" and self.values is not None and len(self.values) <= max_enum_size:
+            spec.enum = sorted(str(v) for v in self.values)
+        return spec
+
+
+def _epoch_seconds(ts: Any, towards: float) -> float:
+    """Float epoch seconds of ``ts``, stepped ``towards`` +/-inf until they do not cut it off."""
+    assert pd is not None
+    target = pd.Timestamp(ts).value
+    seconds = target / 1e9
+    sign = 1 if towards > 0 else -1
+    while sign * (pd.to_datetime(seconds, unit="s").value - target) < 0:
+        seconds = float(np.nextafter(seconds, towards))
+    return seconds
+
+
+@dataclass
+class DatasetProfile:
+    n_rows: int
+    columns: Dict[str, ColumnProfile]
+
+    def to_column_specs(self, max_enum_size: int = 20) -> List[ColumnSpec]:
+        return [c.to_column_spec(max_enum_size) for c in self.columns.values()]
+
+
+class _ColumnAccumulator:
+    """Running per-column state, updated chunk by chunk."""
+
+    def __init__(self, name: str, top_k: int, quantile_error: float) -> None:
+        self.name = name
+        self.top_k = top_k
+        self.capacity = max(10 * top_k, 1000)  # value candidates kept between chunks
+        self.quantile_error = quantile_error
+        self.dtype: Optional[DType] = None
+        self.count = 0
+        self.null_count = 0
+        self.min: Any = None
+        self.max: Any = None
+        self.hll = HyperLogLog()
+        self.kll: Optional[KLLSketch] = None
+        self.counts: Counter = Counter()  # at most ``capacity`` value candidates
+        self.n_chunks = 0
+        self.chunk_distinct = 0  # distinct values of the latest chunk, exact
+        self.pruned = False
+
+    def update(self, series: Any) -> None:
+        assert pd is not None
+        dtype = _observed_dtype(series)
+        if self.dtype is None:
+            self.dtype = dtype
+        elif self.dtype != dtype:
+            # Chunks disagree (e.g. an int chunk and a float chunk with NaNs); widen
+            self.dtype = "float" if {self.dtype, dtype} == {"int", "float"} else "string"
+        self.n_chunks += 1
+        self.count += len(series)
+        self.null_count += int(series.isna().sum())
+        # One hash-table pass gives the top values, the distinct values to sketch and min/max
+        vc = series.value_counts(dropna=True, sort=False)
+        self.chunk_distinct = len(vc)
+        if not len(vc):
+            return
+        uniques = vc.index
+        self.hll.update(pd.util.hash_pandas_object(uniques, index=False).to_numpy())
+        if dtype in ("int", "float", "datetime"):
+            lo, hi = uniques.min(), uniques.max()
+            self.min = lo if self.min is None else min(self.min, lo)
+            self.max = hi if self.max is None else max(self.max, hi)
+        if dtype in ("int", "float"):
+            if self.kll is None:
+                self.kll = KLLSketch(KLLSketch.k_for_error(self.quantile_error))
+            self.kll.update(series.to_numpy(dtype="float64", na_value=np.nan))  # NaNs are skipped
+        # Only a bounded top slice of each chunk becomes Python objects
+        if len(vc) > self.capacity:
+            vc = vc.nlargest(self.capacity)
+            self.pruned = True
+        self.counts.update(dict(zip(vc.index.tolist(), vc.to_numpy().tolist())))
+        if len(self.counts) > self.capacity:
+            self.counts = Counter(dict(self.counts.most_common(self.capacity)))
+            self.pruned = True
+
+    def _distinct(self) -> float:
+        if self.n_chunks <= 1:
+            return float(self.chunk_distinct)
+        return self.hll.estimate() if self.pruned else float(len(self.counts))
+
+    def result(self, quantiles: Sequence[float]) -> ColumnProfile:
+        prof = ColumnProfile(
+            name=self.name,
+            dtype=self.dtype or "string",
+            count=self.count,
+            null_count=self.null_count,
+            min=self.min,
+            max=self.max,
+            distinct=self._distinct(),
+            exact_values=self.n_chunks <= 1 or not self.pruned,
+            top_values=self.counts.most_common(self.top_k),
+            values=None if self.pruned else list(self.counts),
+        )
+        if self.kll is not None and self.kll.n:
+            prof.quantiles = dict(zip(quantiles, self.kll.quantile(quantiles).tolist()))
+        return prof
+
+
+def profile(
+    data: Union["pd.DataFrame", Iterable["pd.DataFrame"]],
+    top_k: int = 10,
+    chunksize: Optional[int] = None,
+    quantiles: Sequence[float] = DEFAULT_QUANTILES,
+    quantile_error: float = 0.01,
+) -> DatasetProfile:
+    """Profile a DataFrame (optionally in ``chunksize``-row slices) or an iterable of chunks.
+
+    Every column is read once per chunk: a single ``value_counts`` hash pass
+    yields the top values, the distinct values fed to HyperLogLog and the
+    min/max, while numeric values stream into a KLL sketch for quantiles.
+    """
+    if pd is None:
+        raise RuntimeError("pandas is required for profiling")
+    if isinstance(data, pd.DataFrame):
+        step = chunksize or max(len(data), 1)
+        chunks: Iterable[Any] = (data.iloc[i : i + step] for i in range(0, max(len(data), 1), step))
+    else:
+        chunks = data
+    accumulators: Dict[str, _ColumnAccumulator] = {}
+    n_rows = 0
+    for chunk in chunks:
+        n_rows += len(chunk)
+        for col in chunk.columns:
+            acc = accumulators.get(col)
+            if acc is None:
+                acc = accumulators[col] = _ColumnAccumulator(col, top_k, quantile_error)
+            acc.update(chunk[col])
+    return DatasetProfile(n_rows=n_rows, columns={name: acc.result(quantiles) for name, acc in accumulators.items()})
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass, field
 from functools import total_ordering
 from typing import Any, Callable, Dict, Iterable, List, Literal, Optional, Pattern, Sequence, Tuple, Union, cast
+import heapq
 import json
+import math
 import re
 
+import numpy as np
+
 try:
     import pandas as pd  # type: ignore
 except Exception:  # pragma: no cover - pandas optional
@@ -113,6 +119,298 @@ class ColumnSpec:
         )
 
 
+@dataclass
+class Violation:
+    """One failed rule in a validation report.
+
+    ``count`` is the number of offending rows for value rules (nulls, ranges,
+    enum, lengths, pattern) and of offending columns for structural rules
+    (missing columns, dtype, target). ``examples`` holds up to
+    ``max_examples`` index labels of offending rows.
+    """
+
+    column: Optional[str]
+    rule: str
+    message: str
+    count: int
+    examples: List[Any] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:  # pragma: no cover - trivial
+        return {
+            "column": self.column,
+            "rule": self.rule,
+            "message": self.message,
+            "count": self.count,
+            "examples": list(self.examples),
+        }
+
+
+@dataclass
+class ValidationReport:
+    """All violations found when validating a dataset, in ``validate`` order."""
+
+    n_rows: int
+    violations: List[Violation] = field(default_factory=list)
+    truncated: bool = False  # validation stopped early once the error budget was used up
+
+    @property
+    def ok(self) -> bool:
+        return not self.violations
+
+    @property
+    def n_errors(self) -> int:
+        return sum(v.count for v in self.violations)
+
+    def merge(self, other: "ValidationReport", max_examples: int = 5) -> "ValidationReport":
+        """Fold the report of a later chunk into this one (in place).
+
+        Row counts add up and examples are kept up to ``max_examples``;
+        structural violations repeated by every chunk are reported once.
+        """
+        by_key = {(v.column, v.rule): v for v in self.violations}
+        for v in other.violations:
+            mine = by_key.get((v.column, v.rule))
+            if mine is None:
+                mine = Violation(v.column, v.rule, v.message, v.count, list(v.examples[:max_examples]))
+                self.violations.append(mine)
+                by_key[(v.column, v.rule)] = mine
+            elif v.rule in _STRUCTURAL_RULES:
+                mine.count = max(mine.count, v.count)
+            else:
+                mine.count += v.count
+                mine.examples.extend(v.examples[: max(0, max_examples - len(mine.examples))])
+        self.n_rows += other.n_rows
+        self.truncated = self.truncated or other.truncated
+        return self
+
+    def raise_if_invalid(self) -> None:
+        """Raise ``ValueError`` with the first violation's message, as ``validate`` does."""
+        if self.violations:
+            raise ValueError(self.violations[0].message)
+
+    def to_dict(self) -> Dict[str, Any]:  # pragma: no cover - trivial
+        return {
+            "n_rows": self.n_rows,
+            "ok": self.ok,
+            "truncated": self.truncated,
+            "violations": [v.to_dict() for v in self.violations],
+        }
+
+
+_STRUCTURAL_RULES = frozenset({"missing_columns", "dtype", "target"})
+
+
+def _chunk_report(validator: "CompiledSchema", df: Any, max_examples: int) -> ValidationReport:
+    """Worker entry point for chunked validation (module level so it pickles)."""
+    return validator.validation_report(df, max_examples=max_examples)
+
+
+def _observed_dtype(series: Any) -> DType:
+    kind = series.dtype.kind
+    if kind == "f":
+        return "float"
+    if kind in ("i", "u"):
+        return "int"
+    if kind == "b":
+        return "bool"
+    if kind == "M":
+        return "datetime"
+    return "string"
+
+
+def _row_violation(
+    column: str, rule: str, message: str, mask: Any, index: Any, max_examples: int
+) -> Optional[Violation]:
+    """Violation for the rows flagged in ``mask``, or None when no row is flagged."""
+    count = int(np.count_nonzero(mask))
+    if count == 0:
+        return None
+    examples = index[np.flatnonzero(mask)[:max_examples]].tolist() if max_examples > 0 else []
+    return Violation(column, rule, message, count, examples)
+
+
+def _numeric_values(series: Any) -> np.ndarray:
+    """Column values as one ndarray with NaN for missing (extension dtypes become float)."""
+    if isinstance(series.dtype, np.dtype):
+        return series.to_numpy()
+    return series.to_numpy(dtype="float64", na_value=np.nan)
+
+
+class _CompiledColumn:
+    """One ColumnSpec with its regex, enum lookup and datetime bounds resolved."""
+
+    def __init__(self, spec: ColumnSpec) -> None:
+        self.spec = spec
+        self.pattern: Optional[Pattern[str]] = None
+        self.pattern_text: Optional[str] = None
+        if spec.pattern is not None:
+            self.pattern = spec.pattern if isinstance(spec.pattern, re.Pattern) else re.compile(spec.pattern)
+            self.pattern_text = self.pattern.pattern
+        # The enum is turned into an Index once; isin then reuses its values
+        # in pandas' vectorized hash-table membership test for every batch.
+        self.enum_index: Optional["pd.Index"] = None
+        if spec.enum is not None:
+            assert pd is not None
+            self.enum_index = pd.Index(spec.enum)
+        self.dt_min = self.dt_max = None
+        if spec.dtype == "datetime":
+            assert pd is not None
+            # min/max interpreted as timestamps if provided
+            if spec.min is not None:
+                self.dt_min = pd.to_datetime(spec.min, unit="s", errors="coerce")
+            if spec.max is not None:
+                self.dt_max = pd.to_datetime(spec.max, unit="s", errors="coerce")
+
+    def _not_in_enum(self, series: Any) -> np.ndarray:
+        """Non-null values outside the enum; nulls are the ``allow_nulls`` rule's concern.
+
+        The raw values are tested first; only the (usually few) misses are
+        checked for nulls and, for string columns, in their string form.
+        """
+        assert self.enum_index is not None
+        outside = ~series.isin(self.enum_index).to_numpy()
+        if outside.any():
+            rest = series[outside]
+            ok = rest.isna().to_numpy()
+            if self.spec.dtype == "string":
+                ok |= rest.astype(str).isin(self.enum_index).to_numpy()
+            outside[outside] = ~ok
+        return outside
+
+    def check(self, series: Any, max_examples: int) -> List[Violation]:
+        """Evaluate every value constraint on ``series`` in one pass over the column."""
+        spec = self.spec
+        name = spec.name
+        index = series.index
+        n = len(series)
+        found: List[Optional[Violation]] = []
+        if not spec.allow_nulls:
+            found.append(_row_violation(
+                name, "nulls", f"Column '{name}' contains nulls but allow_nulls is False",
+                series.isna().to_numpy(), index, max_examples,
+            ))
+
+        if spec.dtype in ("int", "float") and (spec.min is not None or spec.max is not None):
+            values = _numeric_values(series)
+            with np.errstate(invalid="ignore"):
+                if spec.min is not None:
+                    found.append(_row_violation(
+                        name, "min", f"Column '{name}' below minimum {spec.min}",
+                        values < spec.min, index, max_examples,
+                    ))
+                if spec.max is not None:
+                    found.append(_row_violation(
+                        name, "max", f"Column '{name}' above maximum {spec.max}",
+                        values > spec.max, index, max_examples,
+                    ))
+        if spec.dtype in ("int", "float") and spec.enum is not None:
+            found.append(_row_violation(
+                name, "enum", f"Column '{name}' has values outside enum {spec.enum}",
+                self._not_in_enum(series), index, max_examples,
+            ))
+
+        if spec.dtype == "string":
+            # One string conversion and one length array serve the length and pattern rules
+            if spec.min_length is not None or spec.max_length is not None or self.pattern is not None:
+                strings = series.astype(str).to_numpy()
+            if spec.min_length is not None or spec.max_length is not None:
+                lengths = np.fromiter(map(len, strings), dtype=np.intp, count=n)
+                if spec.min_length is not None:
+                    found.append(_row_violation(
+                        name, "min_length", f"Column '{name}' has strings shorter than min_length {spec.min_length}",
+                        lengths < spec.min_length, index, max_examples,
+                    ))
+                if spec.max_length is not None:
+                    found.append(_row_violation(
+                        name, "max_length", f"Column '{name}' has strings longer than max_length {spec.max_length}",
+                        lengths > spec.max_length, index, max_examples,
+                    ))
+            if self.pattern is not None:
+                match = self.pattern.match
+                found.append(_row_violation(
+                    name, "pattern", f"Column '{name}' has strings not matching pattern {self.pattern_text}",
+                    np.fromiter((match(v) is None for v in strings), dtype=bool, count=n), index, max_examples,
+                ))
+            if spec.enum is not None:
+                found.append(_row_violation(
+                    name, "enum", f"Column '{name}' has values outside enum {spec.enum}",
+                    self._not_in_enum(series), index, max_examples,
+                ))
+
+        if spec.dtype == "datetime":
+            dt_min, dt_max = self.dt_min, self.dt_max
+            if getattr(series.dtype, "tz", None) is not None:  # bounds are UTC epoch seconds
+                dt_min = dt_min.tz_localize("UTC") if dt_min is not None else None
+                dt_max = dt_max.tz_localize("UTC") if dt_max is not None else None
+            if spec.min is not None:
+                found.append(_row_violation(
+                    name, "min", f"Column '{name}' has datetimes before min {spec.min}",
+                    (series < dt_min).to_numpy(), index, max_examples,
+                ))
+            if spec.max is not None:
+                found.append(_row_violation(
+                    name, "max", f"Column '{name}' has datetimes after max {spec.max}",
+                    (series > dt_max).to_numpy(), index, max_examples,
+                ))
+        return [v for v in found if v is not None]
+
+
+class CompiledSchema:
+    """Reusable validator for one DatasetSchema (see ``DatasetSchema.compile``).
+
+    Regexes are compiled, enums turned into ``pd.Index`` lookups and
+    datetime bounds converted once, so each
+    call only pays for the per-row checks. Later edits to the schema are not
+    picked up; compile again after changing it.
+    """
+
+    def __init__(self, schema: "DatasetSchema") -> None:
+        self.schema = schema
+        self.required = [c.name for c in schema.columns if c.required]
+        self.target = schema.target
+        # Later specs for the same name win, as in the uncompiled dict lookup
+        self.columns = list({c.name: _CompiledColumn(c) for c in schema.columns}.values())
+
+    def validate(self, df) -> None:
+        """Validate ``df``; raises ValueError on the first validation failure."""
+        self.validation_report(df, max_examples=0).raise_if_invalid()
+
+    def validation_report(self, df, max_examples: int = 5) -> ValidationReport:
+        """Check every constraint and collect all violations (see ``DatasetSchema.validation_report``)."""
+        if pd is None:
+            raise RuntimeError("pandas is required for schema validation")
+        if not isinstance(df, pd.DataFrame):
+            raise TypeError("validate expects a pandas DataFrame")
+        report = ValidationReport(n_rows=len(df))
+        # Required columns
+        missing = [c for c in self.required if c not in df.columns]
+        if missing:
+            report.violations.append(
+                Violation(None, "missing_columns", f"Missing required columns: {missing}", len(missing))
+            )
+        # DType checks and constraints
+        for col in self.columns:
+            spec = col.spec
+            name = spec.name
+            if name not in df.columns:
+                continue
+            series = df[name]
+            observed = _observed_dtype(series)
+            if observed != spec.dtype:
+                report.violations.append(Violation(
+                    name, "dtype", f"Column '{name}' dtype mismatch: expected {spec.dtype}, got {observed}", 1
+                ))
+                continue
+            report.violations.extend(col.check(series, max_examples))
+
+        # Target presence
+        if self.target and self.target not in df.columns:
+            report.violations.append(
+                Violation(self.target, "target", f"Target column '{self.target}' is not present in the dataset", 1)
+            )
+        return report
+
+
 @dataclass
 class DatasetSchema:
     """Dataset schema with versioning and validation utilities."""
@@ -142,97 +440,150 @@ class DatasetSchema:
     def from_json(cls, s: str) -> "DatasetSchema":  # pragma: no cover - trivial
         return cls.from_dict(json.loads(s))
 
+    @classmethod
+    def infer(
+        cls,
+        data: Any,
+        target: Optional[str] = None,
+        version: Optional[SchemaVersion] = None,
+        max_enum_size: int = 20,
+        **profile_kwargs: Any,
+    ) -> "DatasetSchema":
+        """Draft a schema from data by profiling it (see ``profiling.profile``).
+
+        ``data`` is a DataFrame or an iterable of chunks; extra keyword
+        arguments (``chunksize``, ``top_k``, ...) go to ``profile``.
+        """
+        from .profiling import profile  # profiling builds on this module
+
+        prof = profile(data, **profile_kwargs)
+        return cls(
+            columns=prof.to_column_specs(max_enum_size),
+            target=target,
+            version=version if version is not None else SchemaVersion(),
+        )
+
     # ----- Validation -----
     def _map_dtype(self, series) -> DType:
-        # Lazy import guard
-        import numpy as np  # local import to avoid hard dep at module load
+        if pd is None:
+            raise RuntimeError("pandas is required for schema validation")
+        return _observed_dtype(series)
 
+    def compile(self) -> CompiledSchema:
+        """Resolve every constraint once into a reusable validator for repeated calls."""
         if pd is None:
             raise RuntimeError("pandas is required for schema validation")
-        if series.dtype.kind in ("f",):
-            return "float"
-        if series.dtype.kind in ("i", "u"):
-            return "int"
-        if series.dtype.kind in ("b",):
-            return "bool"
-        if np.issubdtype(series.dtype, np.datetime64):
-            return "datetime"
-        return "string"
+        return CompiledSchema(self)
 
     def validate(self, df) -> None:
         """Validate a pandas DataFrame against the schema.
 
         Raises ValueError on first validation failure.
         """
-        if pd is None:
-            raise RuntimeError("pandas is required for schema validation")
-        import pandas as _pd  # type: ignore
-        import numpy as _np  # type: ignore
+        self.validation_report(df, max_examples=0).raise_if_invalid()
 
-        if not isinstance(df, _pd.DataFrame):
-            raise TypeError("validate expects a pandas DataFrame")
-        # Required columns
-        required = [c.name for c in self.columns if c.required]
-        missing = [c for c in required if c not in df.columns]
-        if missing:
-            raise ValueError(f"Missing required columns: {missing}")
-        # DType checks and constraints
-        spec_by_name = {c.name: c for c in self.columns}
-        for name, spec in spec_by_name.items():
-            if name not in df.columns:
-                continue
-            series = df[name]
-            observed = self._map_dtype(series)
-            if observed != spec.dtype:
-                raise ValueError(f"Column '{name}' dtype mismatch: expected {spec.dtype}, got {observed}")
-
-            # Nullability
-            if not spec.allow_nulls and series.isna().any():
-                raise ValueError(f"Column '{name}' contains nulls but allow_nulls is False")
-
-            # Numeric ranges
-            if spec.dtype in ("int", "float"):
-                if spec.min is not None:
-                    if (_np.nanmin(series.to_numpy()) < spec.min):
-                        raise ValueError(f"Column '{name}' below minimum {spec.min}")
-                if spec.max is not None:
-                    if (_np.nanmax(series.to_numpy()) > spec.max):
-                        raise ValueError(f"Column '{name}' above maximum {spec.max}")
-                if spec.enum is not None:
-                    invalid = ~series.isin(spec.enum)
-                    if invalid.any():
-                        raise ValueError(f"Column '{name}' has values outside enum {spec.enum}")
-
-            # String constraints
-            if spec.dtype == "string":
-                ser = series.astype(str)
-                if spec.min_length is not None and (ser.str.len() < spec.min_length).any():
-                    raise ValueError(f"Column '{name}' has strings shorter than min_length {spec.min_length}")
-                if spec.max_length is not None and (ser.str.len() > spec.max_length).any():
-                    raise ValueError(f"Column '{name}' has strings longer than max_length {spec.max_length}")
-                if spec.pattern is not None:
-                    pat = spec.pattern.pattern if isinstance(spec.pattern, re.Pattern) else spec.pattern
-                    assert isinstance(pat, str)
-                    if (~ser.str.match(pat, na=False)).any():
-                        raise ValueError(f"Column '{name}' has strings not matching pattern {pat}")
-                if spec.enum is not None:
-                    invalid = ~ser.isin(spec.enum)
-                    if invalid.any():
-                        raise ValueError(f"Column '{name}' has values outside enum {spec.enum}")
-
-            # Datetime ranges
-            if spec.dtype == "datetime":
-                # min/max interpreted as timestamps if provided
-                if spec.min is not None:
-                    if (series < _pd.to_datetime(spec.min, unit="s", errors="coerce")).any():
-                        raise ValueError(f"Column '{name}' has datetimes before min {spec.min}")
-                if spec.max is not None:
-                    if (series > _pd.to_datetime(spec.max, unit="s", errors="coerce")).any():
-                        raise ValueError(f"Column '{name}' has datetimes after max {spec.max}")
+    def validation_report(self, df, max_examples: int = 5) -> ValidationReport:
+        """Check every constraint and collect all violations instead of raising.
 
-        # Target presence
-        if self.target and self.target not in df.columns:
-            raise ValueError(f"Target column '{self.target}' is not present in the dataset")
+        Each column is evaluated once with all of its constraints (a single
+        string conversion and length array for string rules). Violations are
+        listed in the order ``validate`` would raise them; a column whose dtype
+        does not match is not checked further.
+        """
+        return self.compile().validation_report(df, max_examples=max_examples)
+
+    def validate_chunks(
+        self,
+        chunks: Iterable[Any],
+        n_workers: Optional[int] = None,
+        max_errors: Optional[int] = None,
+        max_examples: int = 5,
+    ) -> ValidationReport:
+        """Validate an iterable of DataFrame chunks and merge their reports.
+
+        With ``n_workers`` > 1 chunks are validated in a process pool, keeping
+        at most two chunks per worker in flight so memory stays bounded; the
+        merged report is in chunk order either way. Once the merged report holds
+        ``max_errors`` offending rows, no further chunks are read and the report
+        is marked ``truncated``.
+        """
+        report = ValidationReport(n_rows=0)
+        validator = self.compile()
+
+        def budget_used() -> bool:
+            return max_errors is not None and report.n_errors >= max_errors
+
+        it = iter(chunks)
+        if not n_workers or n_workers <= 1:
+            for df in it:
+                report.merge(validator.validation_report(df, max_examples=max_examples), max_examples)
+                if budget_used():
+                    report.truncated = True
+                    break
+            return report
+
+        pending: deque[Future[ValidationReport]] = deque()
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            exhausted = False
+            while True:
+                while not exhausted and len(pending) < 2 * n_workers:
+                    df = next(it, None)
+                    if df is None:
+                        exhausted = True
+                    else:
+                        pending.append(pool.submit(_chunk_report, validator, df, max_examples))
+                if not pending:
+                    break
+                report.merge(pending.popleft().result(), max_examples)
+                if budget_used():
+                    report.truncated = True
+                    for fut in pending:
+                        fut.cancel()
+                    break
+        return report
+
+    def validate_csv(
+        self,
+        path: Any,
+        chunksize: int = 100_000,
+        n_workers: Optional[int] = None,
+        max_errors: Optional[int] = None,
+        max_examples: int = 5,
+        **read_csv_kwargs: Any,
+    ) -> ValidationReport:
+        """Stream a CSV file through ``validate_chunks`` without loading it whole.
+
+        Pass ``dtype=``/``parse_dates=`` in ``read_csv_kwargs`` so every chunk
+        gets the dtypes the schema expects; example labels are file row numbers.
+        """
+        if pd is None:
+            raise RuntimeError("pandas is required for schema validation")
+        with pd.read_csv(path, chunksize=chunksize, **read_csv_kwargs) as reader:
+            return self.validate_chunks(reader, n_workers=n_workers, max_errors=max_errors, max_examples=max_examples)
+
+    def validate_parquet(
+        self,
+        path: Any,
+        batch_size: int = 100_000,
+        n_workers: Optional[int] = None,
+        max_errors: Optional[int] = None,
+        max_examples: int = 5,
+    ) -> ValidationReport:
+        """Stream a Parquet file batch by batch through ``validate_chunks`` (requires pyarrow)."""
+        try:
+            import pyarrow.parquet as pq  # type: ignore
+        except Exception as exc:  # pragma: no cover - pyarrow optional
+            raise RuntimeError("pyarrow is required for validate_parquet") from exc
+
+        def frames() -> Iterable[Any]:
+            offset = 0
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+                df = batch.to_pandas()
+                df.index = pd.RangeIndex(offset, offset + len(df))
+                offset += len(df)
+                yield df
+
+        return self.validate_chunks(frames(), n_workers=n_workers, max_errors=max_errors, max_examples=max_examples)
 
     # ----- Backward compatibility checks -----
     def backward_compatibility_report(self, previous: "DatasetSchema") -> Dict[str, Any]:
@@ -300,55 +651,72 @@ class MigrationStep:
     from_version: SchemaVersion
     to_version: SchemaVersion
     func: Callable[[Any], Any]  # expects and returns a DataFrame-like
+    cost: float = 1.0  # relative expense; plan() minimizes the total
 
 
 class MigrationRegistry:
     def __init__(self) -> None:
         self._steps: Dict[Tuple[SchemaVersion, SchemaVersion], MigrationStep] = {}
+        self._outgoing: Dict[SchemaVersion, List[MigrationStep]] = {}
+        # Plans per (from, to); cleared whenever a step is registered
+        self._plans: Dict[Tuple[SchemaVersion, SchemaVersion], Tuple[MigrationStep, ...]] = {}
 
     def register(self, step: MigrationStep) -> None:
         key = (step.from_version, step.to_version)
         if key in self._steps:
             raise ValueError(f"Migration {step.from_version} -> {step.to_version} already registered")
+        if not step.cost >= 0:
+            raise ValueError(f"Migration {step.from_version} -> {step.to_version} has negative cost {step.cost}")
         self._steps[key] = step
+        self._outgoing.setdefault(step.from_version, []).append(step)
+        self._plans.clear()
 
     def get(self, from_v: SchemaVersion, to_v: SchemaVersion) -> Optional[MigrationStep]:  # pragma: no cover - trivial
         return self._steps.get((from_v, to_v))
 
     def plan(self, from_v: SchemaVersion, to_v: SchemaVersion) -> List[MigrationStep]:
-        """Compute a linear plan of migrations.
+        """Compute the cheapest chain of migrations from ``from_v`` to ``to_v``.
 
-        Assumes steps are registered for each consecutive patch/minor/major as needed.
+        Dijkstra over the registered steps (indexed by source version),
+        minimizing total ``cost`` and then the number of steps. Plans are
+        cached per version pair until the next ``register``.
         """
+        key = (from_v, to_v)
+        cached = self._plans.get(key)
+        if cached is None:
+            cached = self._plans[key] = self._shortest_path(from_v, to_v)
+        return list(cached)
+
+    def _shortest_path(self, from_v: SchemaVersion, to_v: SchemaVersion) -> Tuple[MigrationStep, ...]:
         if from_v == to_v:
-            return []
-        # Greedy forward progression by available next step
-        current = from_v
-        plan: List[MigrationStep] = []
-        visited: set[SchemaVersion] = set()
-        # Avoid infinite loops if misconfigured
-        while current != to_v:
-            visited.add(current)
-            # find any step starting at current that moves us closer (by tuple comparison)
-            candidates = [s for (f, _), s in self._steps.items() if f == current]
-            if not candidates:
-                raise ValueError(f"No migration step registered from {current} towards {to_v}")
-            # choose the smallest to_version that is > current (to keep linear)
-            candidates = [c for c in candidates if c.to_version > current]
-            if not candidates:
-                raise ValueError(f"No forward migration step from {current}")
-            next_step = sorted(candidates, key=lambda s: s.to_version)[0]
-            plan.append(next_step)
-            current = next_step.to_version
-            if current in visited:
-                raise ValueError("Cyclic migration steps detected")
-            if current > to_v:
-                # Allow overshoot only if exact step to target exists later; otherwise error
-                pass
-        # Optionally compact plan if last step overshoots (shouldn't with above logic)
-        return plan
+            return ()
+        best: Dict[SchemaVersion, Tuple[float, int]] = {from_v: (0.0, 0)}
+        via: Dict[SchemaVersion, MigrationStep] = {}
+        # The counter breaks ties without ever comparing versions
+        heap: List[Tuple[float, int, int, SchemaVersion]] = [(0.0, 0, 0, from_v)]
+        pushed = 1
+        while heap:
+            cost, hops, _, current = heapq.heappop(heap)
+            if (cost, hops) > best[current]:
+                continue  # stale entry
+            if current == to_v:
+                path: List[MigrationStep] = []
+                while current != from_v:
+                    step = via[current]
+                    path.append(step)
+                    current = step.from_version
+                return tuple(reversed(path))
+            for step in self._outgoing.get(current, ()):
+                cand = (cost + step.cost, hops + 1)
+                if cand < best.get(step.to_version, (math.inf, 0)):
+                    best[step.to_version] = cand
+                    via[step.to_version] = step
+                    heapq.heappush(heap, (cand[0], cand[1], pushed, step.to_version))
+                    pushed += 1
+        raise ValueError(f"No migration path registered from {from_v} to {to_v}")
 
     def migrate(self, df: Any, from_v: SchemaVersion, to_v: SchemaVersion) -> Any:
+        """Apply the (cached) planned steps to ``df`` in order."""
         for step in self.plan(from_v, to_v):
             df = step.func(df)
         return df
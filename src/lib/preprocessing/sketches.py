@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import math
+from typing import List, Sequence, Tuple, Union
+
+import numpy as np
+
+_LCG_MULT = 6364136223846793005
+_LCG_INC = 1442695040888963407
+_MASK64 = (1 << 64) - 1
+
+
+class KLLSketch:
+    """Mergeable streaming quantile sketch (KLL compactor hierarchy).
+
+    Values are buffered in levels; level ``h`` holds items of weight ``2**h``.
+    When a level exceeds its capacity it is sorted and every other item (random
+    offset) is promoted to the next level. Memory is O(k) regardless of stream
+    length and the normalized rank error is about ``2.3 / k`` with high
+    probability (see ``k_for_error``). Exact while fewer than ``k`` values have
+    been seen. NaNs are ignored.
+    """
+
+    def __init__(self, k: int = 200, seed: int = 0) -> None:
+        if k < 8:
+            raise ValueError("k must be >= 8")
+        self.k = int(k)
+        self.n = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.levels: List[np.ndarray] = [np.empty(0, dtype=float)]
+        self._state = int(seed) & _MASK64
+
+    @staticmethod
+    def k_for_error(relative_error: float) -> int:
+        """Smallest ``k`` whose expected normalized rank error is <= relative_error."""
+        if not 0 < relative_error < 1:
+            raise ValueError("relative_error must be in (0, 1)")
+        return max(8, int(math.ceil(2.3 / relative_error)))
+
+    # ----- Updates -----
+    def update(self, values: Union[np.ndarray, Sequence[float]]) -> "KLLSketch":
+        """Add a batch of values."""
+        arr = np.asarray(values, dtype=float).ravel()
+        arr = arr[~np.isnan(arr)]
+        if arr.size == 0:
+            return self
+        self.n += int(arr.size)
+        self.min = min(self.min, float(arr.min()))
+        self.max = max(self.max, float(arr.max()))
+        self.levels[0] = np.concatenate([self.levels[0], arr])
+        self._compress()
+        return self
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """Fold another sketch into this one (in place)."""
+        if other.n == 0:
+            return self
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0, dtype=float))
+        for h, items in enumerate(other.levels):
+            if items.size:
+                self.levels[h] = np.concatenate([self.levels[h], items])
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - 1 - level
+        return max(2, int(math.ceil(self.k * (2.0 / 3.0) ** depth)))
+
+    def _coin(self) -> int:
+        self._state = (self._state * _LCG_MULT + _LCG_INC) & _MASK64
+        return self._state >> 63
+
+    def _compress(self) -> None:
+        h = 0
+        while h < len(self.levels):
+            items = self.levels[h]
+            if items.size <= self._capacity(h):
+                h += 1
+            else:
+                items = np.sort(items)
+                n_pairs = items.size // 2
+                # Keep an odd leftover at this level; promote one item of each pair
+                kept = items[2 * n_pairs:]
+                promoted = items[self._coin():2 * n_pairs:2]
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0, dtype=float))
+                self.levels[h] = kept
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+                # Adding a level shrinks the capacity of all lower levels; rescan
+                h = 0 if h + 2 == len(self.levels) and promoted.size else h + 1
+
+    # ----- Queries -----
+    def weighted_items(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return retained items sorted ascending with their integer weights."""
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(lvl.size, 1 << h, dtype=np.int64) for h, lvl in enumerate(self.levels)])
+        order = np.argsort(items, kind="mergesort")
+        return items[order], weights[order]
+
+    def quantile(self, q: Union[float, Sequence[float], np.ndarray]) -> np.ndarray:
+        """Approximate quantiles, matching ``np.quantile(method='linear')`` while exact."""
+        qs = np.asarray(q, dtype=float)
+        if self.n == 0:
+            return np.full(qs.shape, np.nan)
+        items, weights = self.weighted_items()
+        # Each item stands for a block of ``w`` consecutive ranks; place it at the block center
+        ranks = np.cumsum(weights) - weights + (weights - 1) / 2.0
+        ranks = np.concatenate([[0.0], ranks, [self.n - 1.0]])
+        values = np.concatenate([[self.min], items, [self.max]])
+        return np.interp(qs * (self.n - 1), ranks, values)
+
+    def rank(self, x: Union[float, np.ndarray]) -> np.ndarray:
+        """Approximate fraction of values <= x."""
+        items, weights = self.weighted_items()
+        cum = np.concatenate([[0], np.cumsum(weights)])
+        return cum[np.searchsorted(items, np.asarray(x, dtype=float), side="right")] / max(self.n, 1)
+
+
+def weighted_median(values: np.ndarray, weights: np.ndarray) -> float:
+    """Lower weighted median of ``values``."""
+    order = np.argsort(values, kind="mergesort")
+    cum = np.cumsum(weights[order])
+    return float(values[order][np.searchsorted(cum, cum[-1] / 2.0)])
+
+
+class HyperLogLog:
+    """Mergeable distinct-count sketch over 64-bit hashes.
+
+    Uses ``2**p`` one-byte registers; the relative standard error of
+    ``estimate`` is about ``1.04 / sqrt(2**p)`` (1.6% at the default p=12).
+    Callers hash their values first (e.g. ``pd.util.hash_array``) so the
+    sketch stays independent of the value type.
+    """
+
+    def __init__(self, p: int = 12) -> None:
+        if not 4 <= p <= 18:
+            raise ValueError("p must be in [4, 18]")
+        self.p = int(p)
+        self.registers = np.zeros(1 << self.p, dtype=np.uint8)
+
+    def update(self, hashes: np.ndarray) -> "HyperLogLog":
+        """Add a batch of uint64 hashes."""
+        h = np.asarray(hashes, dtype=np.uint64).ravel()
+        if h.size == 0:
+            return self
+        p = np.uint64(self.p)
+        idx = (h >> (np.uint64(64) - p)).astype(np.intp)
+        rest = h << p
+        # Bit length of ``rest`` from its top 53 bits, which convert to float exactly
+        top = (rest >> np.uint64(11)).astype(np.float64)
+        bit_len = np.frexp(top)[1] + 11
+        rho = np.where(top > 0, 65 - bit_len, 65 - self.p).astype(np.uint8)
+        np.maximum.at(self.registers, idx, rho)
+        return self
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """Fold another sketch with the same ``p`` into this one (in place)."""
+        if other.p != self.p:
+            raise ValueError("Cannot merge HyperLogLog sketches with different p")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self) -> float:
+        m = float(self.registers.size)
+        alpha = 0.7213 / (1.0 + 1.079 / m)
+        raw = alpha * m * m / float(np.sum(np.exp2(-self.registers.astype(np.float64))))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)  # linear counting for small cardinalities
+        return raw
@@ -0,0 +1,85 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.lib.preprocessing.cache import FitCache
+from src.lib.preprocessing.guards import fit_on_train_apply_to_splits
+from src.lib.preprocessing.pipeline import Pipeline
+from src.lib.preprocessing.scalers import MinMaxScaler, RobustScaler, StandardScaler
+
+
+def _frame(seed: int = 0, n: int = 500) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({"x": rng.normal(size=n), "y": rng.exponential(size=n), "tag": rng.choice(["a", "b"], size=n)})
+
+
+def test_fit_cache_hit_skips_fit_and_reproduces_state(tmp_path, monkeypatch):
+    df = _frame()[["x", "y"]]
+    cache = FitCache(tmp_path)
+    first = cache.fit(RobustScaler(), df)
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    calls = []
+    monkeypatch.setattr(RobustScaler, "fit", lambda self, X, y=None: calls.append(1) or self)
+    second = cache.fit(RobustScaler(), df)
+    assert calls == [] and cache.hits == 1
+    assert second.is_fitted and second.feature_names_in_ == ["x", "y"]
+    np.testing.assert_array_equal(second.transform(df), first.transform(df))
+
+    # any change to params, data, column names or y is a different key
+    base = cache.key(RobustScaler(), df)
+    assert cache.key(RobustScaler(quantile_range=(10, 90)), df) != base
+    assert cache.key(RobustScaler(), df.iloc[:-1]) != base
+    assert cache.key(RobustScaler(), df.rename(columns={"y": "z"})) != base
+    assert cache.key(RobustScaler(), df, y=df["x"]) != base
+    assert cache.key(RobustScaler(), df.copy()) == base
+    assert cache.key(RobustScaler(), df.to_numpy()) != base
+    assert cache.key(StandardScaler(), _frame()) != cache.key(StandardScaler(), _frame(seed=1))
+
+
+def test_fit_cache_nested_pipeline_and_split_helper(tmp_path):
+    df = _frame()
+    train, valid = df.iloc[:400][["x", "y"]], df.iloc[400:][["x", "y"]]
+    cache = FitCache(tmp_path)
+    make = lambda: Pipeline([("std", StandardScaler()), ("mm", MinMaxScaler())])  # noqa: E731
+    cold = fit_on_train_apply_to_splits(make(), train, valid, cache=cache)
+    warm = fit_on_train_apply_to_splits(make(), train, valid, cache=cache)
+    assert (cache.hits, cache.misses) == (1, 1)
+    pd.testing.assert_frame_equal(warm.X_valid, cold.X_valid)
+    assert warm.preprocessor.named_steps["std"].is_fitted
+
+    # on a hit the step objects the caller holds are fitted, as after a miss
+    for expect_hit in (False, True):
+        std, mm = StandardScaler(), MinMaxScaler()
+        pipe = cache.fit(Pipeline([("std", std), ("mm", mm)], fuse_affine=False), train.iloc[:300])
+        assert (cache.hits == 2) is expect_hit
+        assert pipe.named_steps["std"] is std and std.is_fitted and mm.is_fitted
+        np.testing.assert_allclose(std.mean_, train.iloc[:300].mean().to_numpy())
+        pd.testing.assert_frame_equal(pipe.transform(valid), mm.transform(std.transform(valid)))
+    # a different nested parameter misses
+    fit_on_train_apply_to_splits(Pipeline([("std", StandardScaler(with_mean=False))]), train, valid, cache=cache)
+    assert cache.misses == 3
+
+
+def test_fit_cache_evicts_least_recently_used(tmp_path):
+    cache = FitCache(tmp_path, max_entries=2)
+    frames = [_frame(seed)[["x"]] for seed in range(3)]
+    paths = []
+    for age, frame in enumerate(frames[:2]):
+        cache.fit(StandardScaler(), frame)
+        paths.append(cache._path(cache.key(StandardScaler(), frame)))
+        os.utime(paths[-1], (1000 + age, 1000 + age))
+    cache.fit(StandardScaler(), frames[0])  # hit refreshes the oldest entry
+    assert cache.hits == 1
+    cache.fit(StandardScaler(), frames[2])
+    assert os.path.exists(paths[0]) and not os.path.exists(paths[1])
+    assert len(os.listdir(tmp_path)) == 2
+
+    # corrupt entries are dropped and refitted
+    with open(paths[0], "wb") as fh:
+        fh.write(b"garbage")
+    cache.fit(StandardScaler(), frames[0])
+    assert cache.misses == 4
+    cache.clear()
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,235 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.lib.preprocessing.feature_engineering import (
+    DateTimeFeatures,
+    HashingEncoder,
+    OneHotEncoder,
+    TemporalAggregates,
+)
+from src.lib.preprocessing.guards import fit_on_train_apply_to_splits
+from src.lib.preprocessing.pipeline import ColumnTransformer, Pipeline
+from src.lib.preprocessing.scalers import StandardScaler
+
+
+def _activity_frame(n: int = 200, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "activity": rng.choice(["walk", "run", "bike", "swim"], size=n),
+        "location": rng.choice([f"loc{i}" for i in range(40)], size=n),
+        "value": rng.normal(size=n),
+    })
+
+
+def _reference_one_hot(df: pd.DataFrame, col: str, cats) -> np.ndarray:
+    return np.column_stack([(df[col] == cat).to_numpy() for cat in cats]).astype(np.uint8)
+
+
+def test_one_hot_encoder_outputs_agree():
+    df = _activity_frame()
+    enc = OneHotEncoder(["activity", "location"]).fit(df)
+    out = enc.transform(df)
+    assert list(out.columns) == enc.feature_names_out_
+    assert out.columns[0] == "value"
+    np.testing.assert_array_equal(out["value"], df["value"])
+    expected = np.hstack([
+        _reference_one_hot(df, col, enc.categories_[col]) for col in ("activity", "location")
+    ])
+    block = out.iloc[:, 1:].to_numpy()
+    assert block.dtype == np.uint8
+    np.testing.assert_array_equal(block, expected)
+
+    dense = OneHotEncoder(["activity", "location"], output="numpy").fit(df)
+    np.testing.assert_array_equal(dense.transform(df), expected)
+    assert dense.feature_names_out_ == list(out.columns[1:])
+
+
+def test_one_hot_encoder_sparse_and_unseen_values():
+    pytest.importorskip("scipy")
+    df = _activity_frame()
+    enc = OneHotEncoder(["activity"], drop_first=True, output="sparse").fit(df)
+    new = pd.DataFrame({"activity": ["run", "climb", None, "bike"], "value": 0.0})
+    mat = enc.transform(new)
+    assert mat.shape == (4, 3)
+    dense = mat.toarray()
+    # dropped first level, unseen level and missing value all encode as zeros
+    np.testing.assert_array_equal(dense.sum(axis=1), [1, 0, 0, 0])
+    assert dense[0, enc.categories_["activity"].index("run")] == 1
+    with pytest.raises(ValueError):
+        OneHotEncoder(["activity"], output="list")
+
+
+def test_one_hot_encoder_infrequent_levels_and_unknown_handling():
+    df = pd.DataFrame({"tag": ["a"] * 50 + ["b"] * 30 + ["c"] * 15 + ["d"] * 4 + ["e"]})
+    enc = OneHotEncoder(["tag"], min_frequency=10, output="numpy").fit(df)
+    assert enc.categories_["tag"] == ["a", "b", "c"]
+    assert enc.infrequent_categories_["tag"] == ["d", "e"]
+    np.testing.assert_array_equal(enc.category_counts_["tag"], [50, 30, 15, 4, 1])
+    assert enc.feature_names_out_ == ["tag__a", "tag__b", "tag__c", "tag__infrequent"]
+
+    capped = OneHotEncoder(["tag"], max_categories=3, output="numpy").fit(df)
+    assert capped.categories_["tag"] == ["a", "b"]
+    assert len(capped.feature_names_out_) == 3
+    assert OneHotEncoder(["tag"], min_frequency=0.1).fit(df).categories_["tag"] == ["a", "b", "c"]
+
+    new = pd.DataFrame({"tag": ["a", "e", "zzz", None]})
+    np.testing.assert_array_equal(enc.transform(new), [[1, 0, 0, 0], [0, 0, 0, 1], [0, 0, 0, 0], [0, 0, 0, 0]])
+    to_infrequent = OneHotEncoder(["tag"], min_frequency=10, handle_unknown="infrequent", output="numpy").fit(df)
+    np.testing.assert_array_equal(to_infrequent.transform(new)[:, -1], [0, 1, 1, 0])
+    strict = OneHotEncoder(["tag"], handle_unknown="error").fit(df)
+    strict.transform(pd.DataFrame({"tag": ["a", None]}))
+    with pytest.raises(ValueError, match="zzz"):
+        strict.transform(new)
+
+    # a real "infrequent" level clashes with the bucket column only when both exist
+    clash = df.replace({"a": "infrequent"})
+    with pytest.raises(ValueError, match="clash"):
+        OneHotEncoder(["tag"], min_frequency=10).fit(clash)
+    with pytest.raises(ValueError, match="clash"):
+        OneHotEncoder(["tag"], handle_unknown="infrequent").fit(clash)
+    assert "tag__infrequent" in OneHotEncoder(["tag"]).fit(clash).feature_names_out_
+
+
+def test_hashing_encoder_is_stateless_stable_and_bounded():
+    df = _activity_frame(n=500)
+    df.loc[::7, "location"] = None
+    enc = HashingEncoder(["activity", "location"], n_features=16, output="numpy")
+    out = enc.transform(df)  # usable without fit
+    assert out.shape == (500, 16)
+    # same inputs hash identically in a fresh encoder and in any batch split
+    fresh = HashingEncoder(["activity", "location"], n_features=16, output="numpy")
+    np.testing.assert_array_equal(fresh.transform(df), out)
+    np.testing.assert_array_equal(enc.transform(df.iloc[100:200]), out[100:200])
+    # each present value contributes one signed unit
+    present = df[["activity", "location"]].notna().sum(axis=1).to_numpy()
+    unsigned = HashingEncoder(["activity", "location"], n_features=16, alternate_sign=False, output="numpy")
+    np.testing.assert_array_equal(unsigned.transform(df).sum(axis=1), present)
+    assert np.all(np.abs(out).sum(axis=1) <= present)
+    # the column salt separates equal values in different columns
+    same = pd.DataFrame({"a": ["x"] * 3, "b": ["x"] * 3})
+    one = HashingEncoder(["a"], n_features=1 << 20, alternate_sign=False, output="numpy").transform(same)
+    two = HashingEncoder(["b"], n_features=1 << 20, alternate_sign=False, output="numpy").transform(same)
+    assert np.argmax(one[0]) != np.argmax(two[0])
+
+    framed = HashingEncoder(["activity", "location"], n_features=16).fit(df)
+    result = framed.transform(df)
+    assert list(result.columns) == framed.feature_names_out_ == ["value", *[f"hash__{i}" for i in range(16)]]
+    pytest.importorskip("scipy")
+    sparse = HashingEncoder(["activity", "location"], n_features=16, output="sparse").transform(df)
+    np.testing.assert_array_equal(sparse.toarray(), out)
+
+
+def test_datetime_features_match_pandas_accessors():
+    rng = np.random.default_rng(1)
+    ts = pd.Series(pd.to_datetime(rng.integers(-2_000_000_000, 4_000_000_000, size=2000), unit="s"))
+    ts[::13] = pd.NaT
+    df = pd.DataFrame({"session": ts, "value": 1.0})
+    features = ["year", "month", "day", "dow", "hour", "minute", "week", "is_weekend"]
+    out = DateTimeFeatures(["session"], features=features, cyclical=["hour"]).fit_transform(df)
+    expected = {
+        "year": ts.dt.year,
+        "month": ts.dt.month,
+        "day": ts.dt.day,
+        "dow": ts.dt.dayofweek,
+        "hour": ts.dt.hour,
+        "minute": ts.dt.minute,
+        "week": ts.dt.isocalendar().week,
+        "is_weekend": (ts.dt.dayofweek >= 5).where(ts.notna()),
+    }
+    for name, ref in expected.items():
+        np.testing.assert_array_equal(out[f"session_{name}"].astype(float), ref.astype(float))
+    angle = 2 * np.pi * ts.dt.hour / 24
+    np.testing.assert_allclose(out["session_hour_sin"], np.sin(angle))
+    np.testing.assert_allclose(out["session_hour_cos"], np.cos(angle))
+    assert list(out.columns)[0] == "value"
+
+    # strings parse with the format cached at fit; tz-aware input reports local wall time
+    strings = pd.DataFrame({"session": ts.dt.strftime("%Y-%m-%d %H:%M:%S")})
+    parsed = DateTimeFeatures(["session"]).fit(strings)
+    assert parsed.formats_ == {"session": "%Y-%m-%d %H:%M:%S"}
+    np.testing.assert_array_equal(parsed.transform(strings)["session_hour"].astype(float), ts.dt.hour.astype(float))
+    aware = pd.DataFrame({"session": pd.to_datetime(["2024-07-01 22:30"]).tz_localize("UTC")})
+    assert DateTimeFeatures(["session"], tz="Europe/Oslo").fit_transform(aware)["session_hour"].iloc[0] == 0
+    with pytest.raises(ValueError):
+        DateTimeFeatures(["session"], cyclical=["year"])
+
+
+def test_temporal_aggregates_match_brute_force_and_respect_split():
+    rng = np.random.default_rng(2)
+    n = 400
+    seconds = rng.integers(0, 4 * 86_400, size=n) // 600 * 600  # coarse grid forces timestamp ties
+    df = pd.DataFrame({
+        "ts": pd.Timestamp("2024-01-01") + pd.to_timedelta(seconds, unit="s"),
+        "user": rng.integers(0, 4, size=n),
+        "hr": rng.normal(70, 5, size=n),
+    })
+    df.loc[::9, "hr"] = np.nan
+    out = TemporalAggregates("ts", "user", ["hr"], windows=["1h", "24h"]).fit_transform(df)
+
+    t = df["ts"].to_numpy()
+    for i in range(0, n, 7):
+        same = df["user"].to_numpy() == df["user"].iloc[i]
+        prior = same & (t < t[i])
+        gap = (t[i] - t[prior].max()) / np.timedelta64(1, "s") if prior.any() else np.nan
+        if not (same & (t == t[i])).sum() > 1:  # tie order is unspecified
+            assert out["ts_since_prev"].iloc[i] == pytest.approx(gap, nan_ok=True)
+        for label, width in (("1h", 3600), ("24h", 86_400)):
+            window = same & (t <= t[i]) & (t > t[i] - np.timedelta64(width, "s"))
+            assert out[f"events_{label}"].iloc[i] == window.sum()
+            vals = df["hr"].to_numpy()[window]
+            ref = np.nanmean(vals) if np.isfinite(vals).any() else np.nan
+            assert out[f"hr_mean_{label}"].iloc[i] == pytest.approx(ref, nan_ok=True)
+
+    cut = pd.Timestamp("2024-01-03")
+    train, valid = df[df["ts"] < cut], df[df["ts"] >= cut]
+    agg = TemporalAggregates("ts", "user", ["hr"], windows=["1h", "24h"]).fit(train)
+    assert len(agg.history_) < len(train)
+    windowed = ["events_1h", "hr_mean_1h", "events_24h", "hr_mean_24h"]
+    np.testing.assert_allclose(agg.transform(valid)[windowed], out.loc[valid.index, windowed])
+    # the fitted frame gets its own training-time features; other early data is refused
+    pd.testing.assert_frame_equal(agg.transform(train), agg.fit_transform(train))
+    with pytest.raises(ValueError, match="Temporal leakage"):
+        agg.transform(train.iloc[1:])
+
+
+def test_temporal_aggregates_fit_on_train_then_transform_flows():
+    rng = np.random.default_rng(5)
+    n = 300
+    df = pd.DataFrame({
+        "t": pd.Timestamp("2024-01-01") + pd.to_timedelta(np.sort(rng.integers(0, 10**6, size=n)), unit="s"),
+        "g": rng.integers(0, 3, size=n),
+        "v": rng.normal(size=n),
+    })
+    train, valid = df.iloc[:200], df.iloc[200:]
+    make = lambda: TemporalAggregates("t", "g", ["v"], windows=["1h", "1d"])  # noqa: E731
+    expected_train = make().fit_transform(train)
+    expected_valid = make().fit(train).transform(valid)
+
+    # other frames are told apart by length and index ends, without hashing them
+    agg = make().fit(train)
+    hashed = []
+    digest = agg._digest
+    agg._digest = lambda frame: hashed.append(len(frame)) or digest(frame)  # type: ignore[method-assign]
+    agg.transform(valid)
+    agg.transform(train)
+    assert hashed == [len(train)]
+    # batches are aggregated against the training history only, not each other
+    first, second = valid.iloc[:50], valid.iloc[50:]
+    agg.transform(first)
+    pd.testing.assert_frame_equal(agg.transform(second), make().fit(train).transform(second))
+
+    res = fit_on_train_apply_to_splits(make(), train, valid)
+    pd.testing.assert_frame_equal(res.X_train, expected_train)
+    pd.testing.assert_frame_equal(res.X_valid, expected_valid)
+
+    pipe = Pipeline([("agg", make()), ("std", ColumnTransformer([("std", StandardScaler(), ["v_lag1", "v_mean_1d"])]))])
+    scaled = pipe.fit_transform(train)
+    ref = StandardScaler().fit(expected_train[["v_lag1", "v_mean_1d"]])
+    np.testing.assert_allclose(scaled.to_numpy(), ref.transform(expected_train[["v_lag1", "v_mean_1d"]]).to_numpy())
+    np.testing.assert_allclose(
+        pipe.transform(valid).to_numpy(), ref.transform(expected_valid[["v_lag1", "v_mean_1d"]]).to_numpy()
+    )
+
+    ct = ColumnTransformer([("agg", make(), ["t", "g", "v"])]).fit(train)
+    np.testing.assert_allclose(ct.transform(valid)["v_mean_1d"].astype(float), expected_valid["v_mean_1d"])
@@ -0,0 +1,209 @@
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.lib.preprocessing.guards import (
+    assert_disjoint_indices,
+    assert_disjoint_splits,
+    check_no_target_in_features,
+    cross_fit_transform,
+    find_overlap,
+    find_split_overlaps,
+)
+from src.lib.preprocessing.scalers import MinMaxScaler, RobustScaler, StandardScaler
+
+
+def _wide(n: int = 2000, n_features: int = 200, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.normal(size=(n, n_features)), columns=[f"f{i}" for i in range(n_features)])
+    df["label"] = rng.choice(["calm", "upset"], size=n)
+    return df
+
+
+def _legacy_leaks(X: pd.DataFrame, y: pd.Series) -> bool:
+    return any(
+        X[c].index.equals(y.index) and np.allclose(np.asarray(X[c]), np.asarray(y), equal_nan=True)
+        for c in X.columns
+        if pd.api.types.is_numeric_dtype(X[c])
+    )
+
+
+def test_check_no_target_detects_copies_like_allclose():
+    X = _wide()
+    rng = np.random.default_rng(1)
+    y = pd.Series(rng.normal(size=len(X)), index=X.index)
+    check_no_target_in_features(X, y)
+    assert not _legacy_leaks(X, y)
+
+    leaked = X.copy()
+    leaked["f150"] = y.to_numpy()
+    leaked.loc[::50, "f150"] = np.nan
+    y_nan = y.where(leaked["f150"].notna())
+    with pytest.raises(ValueError, match="identical to feature column 'f150'"):
+        check_no_target_in_features(leaked, y_nan)
+
+    # float32 round-trip is not bit-identical but is allclose, as before
+    leaked["f150"] = y.to_numpy().astype(np.float32)
+    assert _legacy_leaks(leaked, y)
+    with pytest.raises(ValueError, match="f150"):
+        check_no_target_in_features(leaked, y)
+
+    # differing only after the prefilter rows is not a leak
+    leaked["f150"] = y.to_numpy()
+    leaked.loc[leaked.index[-1], "f150"] += 1.0
+    check_no_target_in_features(leaked, y)
+    # a different index never matches
+    check_no_target_in_features(X.assign(f0=y.to_numpy()), y.reset_index(drop=True).rename(lambda i: i + 1))
+
+    labels = X["label"].copy()
+    with pytest.raises(ValueError, match="'label'"):
+        check_no_target_in_features(X, labels)
+    with pytest.raises(ValueError, match="found in feature columns"):
+        check_no_target_in_features(X, None, target_name="label")
+
+
+def test_check_no_target_detects_copies_with_infinities():
+    X = _wide(n_features=50)
+    rng = np.random.default_rng(3)
+    y = pd.Series(rng.normal(size=len(X)), index=X.index)
+    y.iloc[40] = np.inf
+    X["f20"] = y.to_numpy()
+    X.loc[X.index[-1], "f20"] *= 1 + 1e-9  # allclose, not identical
+    assert _legacy_leaks(X, y)
+    for row, value in ((None, None), (3, np.inf), (7, -np.inf), (11, np.nan)):
+        if row is not None:
+            y.iloc[row] = X.loc[X.index[row], "f20"] = value
+        with pytest.raises(ValueError, match="identical to feature column 'f20'"):
+            check_no_target_in_features(X, y)
+
+    # the same infinities with a different sign, or a finite value in their place, do not match
+    for value in (-np.inf, 1e300):
+        X.loc[X.index[40], "f20"] = value
+        assert not _legacy_leaks(X, y)
+        check_no_target_in_features(X, y)
+
+
+def test_check_no_target_correlation_threshold():
+    X = _wide(n_features=50)
+    rng = np.random.default_rng(2)
+    y = pd.Series(3.0 * X["f7"].to_numpy() + rng.normal(scale=0.1, size=len(X)) + 10, index=X.index)
+    check_no_target_in_features(X, y)  # not a copy
+    with pytest.raises(ValueError, match=r"correlated .* 'f7'"):
+        check_no_target_in_features(X, y, corr_threshold=0.95)
+    X.loc[::3, "f7"] = np.nan
+    with pytest.raises(ValueError, match="'f7'"):
+        check_no_target_in_features(X, y, corr_threshold=0.9)
+    expected = np.corrcoef(X["f9"], y)[0, 1]
+    check_no_target_in_features(X.drop(columns="f7"), y, corr_threshold=abs(expected) + 0.05)
+    with pytest.raises(ValueError, match="'f"):
+        check_no_target_in_features(X.drop(columns="f7"), y, corr_threshold=abs(expected) - 1e-9)
+
+
+def test_assert_disjoint_indices_accepts_ids_of_any_kind():
+    df = pd.DataFrame({"student": np.repeat(np.arange(100), 5), "x": 0.0})
+    train, valid = df.iloc[:300], df.iloc[300:]
+    assert_disjoint_indices(train, valid)
+    assert_disjoint_indices(train.index.to_numpy(), list(valid.index))
+    assert_disjoint_indices(np.zeros((5, 2)), np.zeros((5, 2)))  # 2-D matrices carry no IDs
+    with pytest.raises(ValueError, match=r"1 shared IDs, e.g. \[59\]"):
+        assert_disjoint_indices(df.iloc[:298], df.iloc[298:], on="student")  # student 59 straddles the cut
+    with pytest.raises(ValueError, match="overlap"):
+        assert_disjoint_indices(train, df.iloc[299:])
+    with pytest.raises(KeyError):
+        assert_disjoint_indices(train, valid, on="session")
+
+    # sparse integers, strings and mixed inputs
+    rng = np.random.default_rng(0)
+    big = rng.choice(10**15, size=50_000, replace=False)
+    assert_disjoint_indices(big[:25_000], big[25_000:])
+    report = find_overlap(big[:25_000], np.concatenate([big[25_000:], big[:3]]))
+    assert report.count == 3 and sorted(report.examples) == sorted(big[:3].tolist())
+    assert find_overlap(pd.Index(["s1", "s2", "s3"]), ["s3", "s4", None]).examples == ["s3"]
+    assert find_overlap(np.arange(10), np.arange(10, 20)).count == 0
+
+    # stopping at the first overlapping block gives a lower bound
+    many = np.arange(3 << 20)
+    with pytest.raises(ValueError, match="at least"):
+        assert_disjoint_indices(many, many[::2])
+    assert find_overlap(many, many[::2]).count == len(many[::2])
+
+
+def test_assert_disjoint_splits_checks_all_pairs():
+    folds = [np.arange(i * 10, (i + 1) * 10) for i in range(5)]
+    assert_disjoint_splits(folds)
+    assert find_split_overlaps(folds) == {}
+    folds[3] = np.append(folds[3], [5, 15])
+    folds[4] = np.append(folds[4], [5])
+    reports = find_split_overlaps(folds)
+    assert sorted(reports) == [(0, 3), (0, 4), (1, 3), (3, 4)]
+    assert reports[(0, 3)].examples == [5] and reports[(3, 4)].count == 1
+    with pytest.raises(ValueError, match="splits 0 and 3 share 1 IDs"):
+        assert_disjoint_splits(folds)
+
+    sessions = [pd.DataFrame({"session": ids}) for ids in (["a", "b"], ["c", None], ["d", "a", None])]
+    with pytest.raises(ValueError, match=r"splits 0 and 2 share 1 IDs \(e.g. \['a'\]\)"):
+        assert_disjoint_splits(sessions, on="session")
+    with pytest.raises(TypeError):
+        assert_disjoint_splits([np.zeros((2, 2)), np.zeros(2)])
+
+
+def test_missing_ids_are_not_overlaps():
+    a = pd.DataFrame({"user": [1.0, np.nan, 3.0, np.nan]})
+    b = pd.DataFrame({"user": [np.nan, 4.0, None]})
+    assert find_overlap(a, b, on="user").count == 0
+    assert_disjoint_indices(a, b, on="user")
+    assert find_overlap(np.array(["x", None, np.nan], dtype=object), np.array([None, "y"], dtype=object)).count == 0
+    reports = find_split_overlaps([a, b, pd.DataFrame({"user": [np.nan, 3.0]})], on="user")
+    assert list(reports) == [(0, 2)] and reports[(0, 2)].examples == [3.0]
+    assert find_overlap(pd.Index(pd.to_datetime(["2024-01-01", None])), pd.to_datetime([None, "2024-01-02"])).count == 0
+
+
+@pytest.mark.parametrize(
+    "make",
+    [
+        StandardScaler,
+        partial(StandardScaler, nan_policy="omit", outlier_mask_storage="packed"),
+        partial(MinMaxScaler, feature_range=(-1, 1), nan_policy="omit"),
+        partial(StandardScaler, outlier_detection="zscore"),  # no mergeable statistics: fitted per fold
+    ],
+)
+def test_cross_fit_transform_matches_per_fold_fits(make):
+    rng = np.random.default_rng(3)
+    X = pd.DataFrame(rng.normal(5, 2, size=(503, 4)), columns=list("abcd"), index=rng.permutation(503) + 1000)
+    X.iloc[::17, 2] = np.nan
+    folds = np.array_split(rng.permutation(len(X))[:480], 5)  # 23 rows are never validated
+    results = cross_fit_transform(make(), X, folds, n_jobs=1)
+    assert len(results) == 5
+    for fold, res in zip(folds, results):
+        train = np.setdiff1d(np.arange(len(X)), fold)
+        ref = make().fit(X.iloc[train])
+        assert res.preprocessor.n_samples_seen_ == len(train)
+        assert res.preprocessor.feature_names_in_ == list("abcd")
+        pd.testing.assert_frame_equal(res.X_valid, ref.transform(X.iloc[fold]), rtol=1e-9)
+        pd.testing.assert_frame_equal(res.X_train, ref.transform(X.iloc[train]), rtol=1e-9)
+
+
+def test_cross_fit_transform_pairs_pool_and_leakage_checks():
+    rng = np.random.default_rng(4)
+    X = rng.exponential(size=(200, 3))
+    pairs = [(np.arange(0, 100), np.arange(100, 150)), (np.arange(50, 150), np.arange(150, 200))]
+    results = cross_fit_transform(RobustScaler(), X, pairs, n_jobs=2)
+    for (train, valid), res in zip(pairs, results):
+        np.testing.assert_allclose(res.X_valid, RobustScaler().fit(X[train]).transform(X[valid]))
+    # boolean masks and the single-pass path on ndarrays
+    masks = [np.arange(200) % 4 == k for k in range(4)]
+    fast = cross_fit_transform(StandardScaler(), X, masks)
+    np.testing.assert_allclose(fast[1].X_valid, StandardScaler().fit(X[~masks[1]]).transform(X[masks[1]]))
+    # the single-pass fits keep outlier counts only, not an n_train x n_features mask
+    assert fast[1].preprocessor.outlier_mask_ is None and not fast[1].preprocessor.outlier_counts_.any()
+    assert fast[1].preprocessor.get_outlier_mask().shape == (150, 3)
+
+    with pytest.raises(ValueError, match="overlap"):
+        cross_fit_transform(StandardScaler(), X, [(np.arange(0, 120), np.arange(100, 200))])
+    df = pd.DataFrame(X, index=np.arange(200) % 150)  # duplicated labels leak across the split
+    with pytest.raises(ValueError, match="overlap"):
+        cross_fit_transform(StandardScaler(), df, [np.arange(150, 200)])
+    with pytest.raises(ValueError, match="no training rows"):
+        cross_fit_transform(StandardScaler(), X, [np.arange(200)])
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.lib.preprocessing.core import BasePreprocessor
+from src.lib.preprocessing.feature_engineering import (
+    DateTimeFeatures,
+    HashingEncoder,
+    OneHotEncoder,
+    TemporalAggregates,
+)
+from src.lib.preprocessing.persistence import load
+from src.lib.preprocessing.pipeline import ColumnTransformer, Pipeline
+from src.lib.preprocessing.scalers import (
+    MedianMADScaler,
+    MinMaxScaler,
+    QuantileTransformer,
+    RobustScaler,
+    StandardScaler,
+)
+
+
+def _frame(n: int = 300, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "x": rng.normal(size=n),
+        "y": rng.exponential(size=n),
+        "tag": rng.choice(["a", "b", "c"], size=n),
+        "ts": pd.Timestamp("2024-01-01", tz="UTC")
+        + pd.to_timedelta(np.sort(rng.integers(0, 10**6, size=n)), unit="s"),
+    })
+
+
+def _assert_same(left, right):
+    if isinstance(left, pd.DataFrame):
+        pd.testing.assert_frame_equal(left, right)
+    elif hasattr(left, "toarray"):
+        np.testing.assert_array_equal(left.toarray(), right.toarray())
+    else:
+        np.testing.assert_array_equal(left, right)
+
+
+@pytest.mark.parametrize(
+    "make, columns",
+    [
+        (lambda: RobustScaler(quantile_backend="sketch"), ["x", "y"]),
+        (lambda: MedianMADScaler(), ["x", "y"]),
+        (lambda: StandardScaler(outlier_detection="iqr", clip_outliers=True, outlier_mask_storage="packed"),
+         ["x", "y"]),
+        (lambda: MinMaxScaler(feature_range=(-1, 1), dtype="float32"), ["x", "y"]),
+        (lambda: QuantileTransformer(n_quantiles=50, output_distribution="normal"), ["x", "y"]),
+        (lambda: OneHotEncoder(["tag"], min_frequency=0.2, output="numpy"), None),
+        (lambda: HashingEncoder(["tag"], n_features=8), None),
+        (lambda: DateTimeFeatures(["ts"], cyclical=["hour"], tz="Europe/Oslo"), None),
+        (lambda: TemporalAggregates("ts", "tag", ["x"], windows=["1h", "1d"]), None),
+        (lambda: Pipeline([("std", StandardScaler()), ("mm", MinMaxScaler(clip=True))]), ["x", "y"]),
+        (lambda: ColumnTransformer([
+            ("std", StandardScaler(), ["x"]),
+            ("ohe", OneHotEncoder(["tag"], output="numpy"), ["tag"]),
+        ]), None),
+    ],
+)
+def test_save_load_round_trip(tmp_path, make, columns):
+    df = _frame()
+    if columns is not None:
+        df = df[columns]
+    train, test = df.iloc[:200], df.iloc[200:]
+    fitted = make().fit(train)
+    path = tmp_path / "state.bin"
+    fitted.save(path)
+    for mmap in (True, False):
+        restored = BasePreprocessor.load(path, mmap=mmap)
+        assert type(restored) is type(fitted)
+        assert restored.feature_names_out_ == fitted.feature_names_out_
+        _assert_same(restored.transform(test), fitted.transform(test))
+        if hasattr(fitted, "inverse_transform") and columns is not None:
+            out = fitted.transform(test)
+            _assert_same(restored.inverse_transform(out), fitted.inverse_transform(out))
+
+
+def test_load_memory_maps_arrays_and_checks_class(tmp_path):
+    X = np.random.default_rng(1).normal(size=(1000, 64))
+    scaler = StandardScaler().fit(X)
+    path = tmp_path / "scaler.bin"
+    scaler.save(path)
+
+    mapped = StandardScaler.load(path)
+    assert isinstance(mapped.mean_.base, np.memmap)
+    assert mapped.mean_.ctypes.data % 64 == 0
+    mapped.mean_[0] = 123.0  # copy-on-write: the file is untouched
+    assert StandardScaler.load(path).mean_[0] == scaler.mean_[0]
+    assert not isinstance(StandardScaler.load(path, mmap=False).mean_.base, np.memmap)
+
+    unfitted = tmp_path / "unfitted.bin"
+    MinMaxScaler(feature_range=(2, 3)).save(unfitted)
+    fresh = load(unfitted)
+    assert not fresh.is_fitted and fresh.feature_range == (2, 3)
+    with pytest.raises(TypeError, match="MinMaxScaler"):
+        StandardScaler.load(unfitted)
+    (tmp_path / "junk.bin").write_bytes(b"not a preprocessor")
+    with pytest.raises(ValueError):
+        load(tmp_path / "junk.bin")
@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+
+from src.lib.preprocessing.feature_engineering import ColumnSelector, DateTimeFeatures, OneHotEncoder
+from src.lib.preprocessing.pipeline import ColumnTransformer, Pipeline
+from src.lib.preprocessing.scalers import MinMaxScaler, RobustScaler, StandardScaler
+
+
+def _frame(n: int = 50) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "a": rng.normal(size=n),
+        "b": rng.uniform(0, 10, size=n),
+        "trigger": rng.choice(["noise", "light", "touch"], size=n),
+    })
+
+
+def test_pipeline_matches_manual_chain_and_fuses_affine_steps():
+    df = _frame()
+    num = ["a", "b"]
+    pipe = Pipeline([
+        ("select", ColumnSelector(num)),
+        ("robust", RobustScaler()),
+        ("std", StandardScaler()),
+        ("minmax", MinMaxScaler()),
+    ])
+    out = pipe.fit_transform(df)
+
+    manual = df[num]
+    for scaler in (RobustScaler(), StandardScaler(), MinMaxScaler()):
+        manual = scaler.fit_transform(manual)
+
+    assert isinstance(out, pd.DataFrame)
+    assert list(out.columns) == num
+    np.testing.assert_allclose(out.to_numpy(), manual.to_numpy(), rtol=1e-10, atol=1e-12)
+    np.testing.assert_allclose(pipe.transform(df).to_numpy(), manual.to_numpy(), rtol=1e-10, atol=1e-12)
+    # ColumnSelector plus one fused multiply-add for the three scalers
+    assert len(pipe._stages) == 2 and isinstance(pipe._stages[1], tuple)
+
+
+def test_pipeline_mixes_frame_and_array_stages():
+    df = _frame()
+    pipe = Pipeline([
+        ("ohe", OneHotEncoder(["trigger"])),
+        ("scale", MinMaxScaler(clip=True)),
+    ]).fit(df)
+    out = pipe.transform(df)
+    assert list(out.columns) == ["a", "b", "trigger__light", "trigger__noise", "trigger__touch"]
+    assert out.index.equals(df.index)
+    assert out.to_numpy().min() >= 0.0 and out.to_numpy().max() <= 1.0
+
+
+def test_pipeline_on_ndarray_returns_ndarray():
+    X = np.arange(12, dtype=float).reshape(6, 2)
+    pipe = Pipeline([("std", StandardScaler()), ("minmax", MinMaxScaler())], fuse_affine=False)
+    out = pipe.fit_transform(X)
+    assert isinstance(out, np.ndarray)
+    np.testing.assert_allclose(out.min(axis=0), 0.0, atol=1e-12)
+    np.testing.assert_allclose(out.max(axis=0), 1.0, atol=1e-12)
+    np.testing.assert_allclose(pipe.inverse_transform(out), X, rtol=1e-10, atol=1e-10)
+
+
+def test_column_transformer_matches_per_branch_results():
+    df = _frame()
+    df["ts"] = pd.date_range("2024-01-01", periods=len(df), freq="h")
+    ct = ColumnTransformer(
+        [
+            ("intensity", RobustScaler(), ["a", "b"]),
+            ("trigger", OneHotEncoder(["trigger"]), ["trigger"]),
+            ("time", DateTimeFeatures(["ts"], features=("dow", "hour")), ["ts"]),
+        ],
+        n_jobs=3,
+    )
+    out = ct.fit_transform(df)
+    assert list(out.columns) == [
+        "a", "b", "trigger__light", "trigger__noise", "trigger__touch", "ts_dow", "ts_hour",
+    ]
+    expected = RobustScaler().fit_transform(df[["a", "b"]])
+    np.testing.assert_allclose(out[["a", "b"]].to_numpy(), expected.to_numpy())
+    np.testing.assert_array_equal(out["ts_hour"].to_numpy(), df["ts"].dt.hour.to_numpy())
+    assert out.index.equals(df.index)
+
+
+def test_column_transformer_ndarray_with_passthrough():
+    X = np.arange(20, dtype=float).reshape(5, 4)
+    ct = ColumnTransformer([("mm", MinMaxScaler(), [0, 2])], remainder="passthrough", n_jobs=1).fit(X)
+    out = ct.transform(X)
+    assert out.shape == (5, 4)
+    np.testing.assert_allclose(out[:, :2], MinMaxScaler().fit_transform(X[:, [0, 2]]))
+    np.testing.assert_array_equal(out[:, 2:], X[:, [1, 3]])
+
+
+def test_column_transformer_promotes_output_dtype_per_call():
+    train = pd.DataFrame({"ts": pd.date_range("2024-01-01", periods=24, freq="h")})
+    ct = ColumnTransformer([("time", DateTimeFeatures(["ts"], features=("hour", "dow")), ["ts"])])
+    assert ct.fit_transform(train)["ts_hour"].tolist() == list(range(24))
+
+    test = train.iloc[:3].copy()
+    test.loc[1, "ts"] = pd.NaT
+    out = ct.transform(test)
+    assert out["ts_hour"].dtype == float
+    np.testing.assert_array_equal(out["ts_hour"].to_numpy(), [0.0, np.nan, 2.0])
+
+
+def test_pipeline_names_follow_array_output_of_dataframe_stage():
+    df = pd.DataFrame({"c": ["x", "y", "z", "x"], "v": [1.0, 2.0, 3.0, 4.0]}, index=[5, 6, 7, 8])
+    pipe = Pipeline([("oh", OneHotEncoder(columns=["c"], output="numpy")), ("s", StandardScaler())])
+    out = pipe.fit_transform(df)
+    assert list(out.columns) == ["c__x", "c__y", "c__z"] and out.index.equals(df.index)
+    expected = StandardScaler().fit_transform(OneHotEncoder(columns=["c"], output="numpy").fit_transform(df))
+    np.testing.assert_allclose(out.to_numpy(), expected)
+    pd.testing.assert_frame_equal(pipe.transform(df), out)
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+
+from src.lib.preprocessing.profiling import profile
+from src.lib.preprocessing.schema import DatasetSchema
+from src.lib.preprocessing.sketches import HyperLogLog
+
+
+def _sessions(n: int = 20_000, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "duration": rng.exponential(30.0, size=n),
+        "steps": rng.integers(0, 5000, size=n),
+        "mood": rng.choice(["calm", "tense", "neutral"], size=n, p=[0.5, 0.2, 0.3]),
+        "device": np.char.add("dev-", rng.integers(0, 8000, size=n).astype(str)),
+        "start": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 10**7, size=n), unit="s"),
+    })
+    df.loc[::50, "duration"] = np.nan
+    return df
+
+
+def test_hyperloglog_estimate_and_merge():
+    values = np.arange(200_000).astype(str).astype(object)
+    hashes = pd.util.hash_array(values)
+    a = HyperLogLog().update(hashes[:120_000])
+    b = HyperLogLog().update(hashes[80_000:])
+    assert abs(a.merge(b).estimate() / 200_000 - 1) < 0.05
+    assert abs(HyperLogLog().update(hashes[:100]).estimate() - 100) < 3
+
+
+def test_profile_single_pass_and_chunked_agree():
+    df = _sessions()
+    full = profile(df, top_k=3)
+    chunked = profile(df, top_k=3, chunksize=1500)
+    for prof in (full, chunked):
+        assert prof.n_rows == len(df)
+        dur = prof.columns["duration"]
+        assert dur.dtype == "float" and dur.null_count == df["duration"].isna().sum()
+        assert dur.min == df["duration"].min() and dur.max == df["duration"].max()
+        assert abs(dur.quantiles[0.5] - df["duration"].median()) < 0.05 * df["duration"].median()
+        assert prof.columns["mood"].top_values[0] == ("calm", (df["mood"] == "calm").sum())
+        assert abs(prof.columns["device"].distinct / df["device"].nunique() - 1) < 0.05
+        assert prof.columns["start"].max == df["start"].max()
+    assert full.columns["device"].exact_values and full.columns["device"].distinct == df["device"].nunique()
+    assert not chunked.columns["device"].exact_values
+
+
+def test_infer_drafts_schema_that_accepts_the_data():
+    df = _sessions(n=2000)
+    schema = DatasetSchema.infer(df, target="mood", chunksize=500)
+    specs = {c.name: c for c in schema.columns}
+    assert specs["duration"].allow_nulls and not specs["steps"].allow_nulls
+    assert specs["mood"].enum == ["calm", "neutral", "tense"]
+    assert specs["device"].enum is None
+    assert specs["steps"].min == df["steps"].min() and specs["steps"].max == df["steps"].max()
+    schema.validate(df)
+
+
+def test_inferred_schema_round_trips_nanosecond_times_and_nulls():
+    rng = np.random.default_rng(1)
+    ns = pd.Timestamp("2024-03-01").value + rng.integers(0, 10**12, size=500)
+    df = pd.DataFrame({
+        "ts": pd.to_datetime(ns),
+        "aware": pd.to_datetime(ns).tz_localize("UTC"),
+        "mood": rng.choice(["calm", "tense"], size=500).astype(object),
+        "level": rng.integers(1, 4, size=500).astype(float),
+    })
+    df.loc[::7, "mood"] = None
+    df.loc[::11, "level"] = np.nan
+    schema = DatasetSchema.infer(df)
+    assert schema.validation_report(df).ok
+    assert {c.name: c.enum for c in schema.columns}["mood"] == ["calm", "tense"]
+    schema.columns[3].enum = [1, 2, 3]
+    assert schema.validation_report(df).ok
+    assert not schema.validation_report(df.assign(mood="angry")).ok
+
+
+def test_infer_enum_does_not_depend_on_top_k():
+    rng = np.random.default_rng(2)
+    levels = [f"lvl{i:02d}" for i in range(15)]
+    df = pd.DataFrame({"level": rng.choice(levels, size=3000)})
+    for chunksize in (None, 400):
+        prof = profile(df, top_k=5, chunksize=chunksize)
+        assert len(prof.columns["level"].top_values) == 5 and prof.columns["level"].distinct == 15
+        schema = DatasetSchema.infer(df, chunksize=chunksize, max_enum_size=20)
+        assert schema.columns[0].enum == levels
+        assert DatasetSchema.infer(df, max_enum_size=10).columns[0].enum is None
@@ -1,14 +1,20 @@
 import math
+import os
+import time
+from functools import partial
 import numpy as np
+import pandas as pd
 import pytest
 
 from src.lib.preprocessing.scalers import (
+    erf,
     RobustScaler,
     MedianMADScaler,
     StandardScaler,
     MinMaxScaler,
     QuantileTransformer,
 )
+from src.lib.preprocessing.sketches import KLLSketch
 
 try:
     # property-based tests are optional; if hypothesis missing, skip gracefully
@@ -46,6 +52,29 @@ def test_standard_scaler_zscore_and_outlier_bounds():
     assert abs(Xt[0, 1]) < 5
 
 
+def test_standard_scaler_masked_fit_matches_per_feature_reference():
+    rng = np.random.default_rng(10)
+    X = rng.normal(size=(500, 4))
+    X[::50, 0] = 40.0
+    X[::70, 2] = -25.0
+    dense = StandardScaler(outlier_detection="iqr").fit(X)
+    mask = dense.outlier_mask_
+    assert mask is not None and mask.shape == X.shape
+    for j in range(X.shape[1]):
+        kept = X[~mask[:, j], j]
+        assert dense.mean_[j] == pytest.approx(kept.mean(), rel=1e-12)
+        assert dense.scale_[j] == pytest.approx(kept.std(), rel=1e-12)
+    np.testing.assert_array_equal(dense.outlier_counts_, mask.sum(axis=0))
+
+    packed = StandardScaler(outlier_detection="iqr", outlier_mask_storage="packed").fit(X)
+    assert packed.outlier_mask_ is None and packed.outlier_mask_packed_.nbytes < mask.nbytes
+    np.testing.assert_array_equal(packed.get_outlier_mask(), mask)
+    counts = StandardScaler(outlier_detection="iqr", outlier_mask_storage="counts").fit(X)
+    assert counts.get_outlier_mask() is None
+    np.testing.assert_array_equal(counts.outlier_counts_, dense.outlier_counts_)
+    np.testing.assert_allclose(counts.scale_, dense.scale_)
+
+
 def test_standard_scaler_clip_outliers_effect():
     X = np.array([[1.0], [2.0], [3.0], [1000.0]])
     s_noclip = StandardScaler(outlier_detection="iqr", clip_outliers=False, exclude_outliers_from_fit=False).fit(X)
@@ -85,6 +114,187 @@ def test_quantile_transformer_uniform_and_normal():
     assert abs(float(np.mean(Z))) < 0.1
 
 
+def test_standard_scaler_partial_fit_matches_fit():
+    rng = np.random.default_rng(3)
+    X = rng.normal(loc=50.0, scale=7.0, size=(1000, 3))
+    full = StandardScaler().fit(X)
+    inc = StandardScaler()
+    for chunk in np.array_split(X, [10, 11, 400, 730]):
+        inc.partial_fit(chunk)
+    assert inc.n_samples_seen_ == 1000
+    np.testing.assert_allclose(inc.mean_, full.mean_, rtol=1e-12)
+    np.testing.assert_allclose(inc.scale_, full.scale_, rtol=1e-10)
+    with pytest.raises(ValueError):
+        StandardScaler(outlier_detection="zscore").partial_fit(X)
+
+
+def test_minmax_scaler_partial_fit_matches_fit():
+    rng = np.random.default_rng(4)
+    X = rng.uniform(-5, 5, size=(300, 2))
+    full = MinMaxScaler(feature_range=(-1, 1)).fit(X)
+    inc = MinMaxScaler(feature_range=(-1, 1))
+    for chunk in np.array_split(X, 7):
+        inc.partial_fit(chunk)
+    np.testing.assert_array_equal(inc.data_min_, full.data_min_)
+    np.testing.assert_array_equal(inc.data_max_, full.data_max_)
+    np.testing.assert_allclose(inc.transform(X), full.transform(X))
+
+
+def test_kll_sketch_rank_error_and_merge():
+    rng = np.random.default_rng(5)
+    x = rng.lognormal(size=200_000)
+    a = KLLSketch(k=KLLSketch.k_for_error(0.01), seed=1)
+    b = KLLSketch(k=KLLSketch.k_for_error(0.01), seed=2)
+    for chunk in np.array_split(x[:100_000], 20):
+        a.update(chunk)
+    b.update(x[100_000:])
+    a.merge(b)
+    assert a.n == x.size and a.min == x.min() and a.max == x.max()
+    qs = np.linspace(0.01, 0.99, 50)
+    ranks = np.searchsorted(np.sort(x), a.quantile(qs)) / x.size
+    assert np.max(np.abs(ranks - qs)) < 0.01
+    # exact while the stream fits in the first level
+    small = np.arange(50.0)
+    np.testing.assert_allclose(KLLSketch(k=100).update(small).quantile(qs), np.quantile(small, qs))
+
+
+def test_sketch_backends_partial_fit_close_to_exact():
+    rng = np.random.default_rng(6)
+    X = np.column_stack([rng.normal(10, 2, 50_000), rng.exponential(3, 50_000)])
+    chunks = np.array_split(X, 9)
+    for cls in (RobustScaler, MedianMADScaler):
+        exact = cls().fit(X)
+        sk = cls(quantile_backend="sketch", relative_error=0.005)
+        for chunk in chunks:
+            sk.partial_fit(chunk)
+        np.testing.assert_allclose(sk.center_, exact.center_, rtol=0.02, atol=0.05)
+        np.testing.assert_allclose(sk.scale_, exact.scale_, rtol=0.05)
+        with pytest.raises(ValueError):
+            cls().partial_fit(X)
+    qt = QuantileTransformer(n_quantiles=100, quantile_backend="sketch")
+    for chunk in chunks:
+        qt.partial_fit(chunk)
+    U = qt.transform(X)
+    U_exact = QuantileTransformer(n_quantiles=100).fit(X).transform(X)
+    assert np.max(np.abs(U - U_exact)) < 0.01
+
+
+def test_quantile_transformer_vectorized_engine_matches_per_column_interp():
+    rng = np.random.default_rng(7)
+    X = np.column_stack([
+        rng.normal(size=400),
+        rng.integers(0, 4, size=400).astype(float),  # heavy ties in the quantile table
+        1e6 + rng.exponential(size=400) * 1e-6,  # tiny span relative to magnitude
+        np.full(400, 2.0),  # constant
+    ])
+    qt = QuantileTransformer(n_quantiles=50, engine="vectorized").fit(X)
+    X_new = np.vstack([X, X[:5] - 100.0, X[:5] + 100.0, qt.quantiles_])
+    expected = np.column_stack([
+        np.interp(X_new[:, j], qt.quantiles_[:, j], qt.q_grid_, left=0.0, right=1.0) for j in range(3)
+    ])
+    U = qt.transform(X_new)
+    np.testing.assert_allclose(U[:, :3], expected, atol=1e-12)
+    assert np.all(U[:, 3] == 0.5)
+    inv = qt.inverse_transform(U)
+    expected_inv = np.column_stack([np.interp(U[:, j], qt.q_grid_, qt.quantiles_[:, j]) for j in range(3)])
+    np.testing.assert_allclose(inv[:, :3], expected_inv, atol=1e-9)
+    loop = QuantileTransformer(n_quantiles=50, engine="loop").fit(X)
+    np.testing.assert_allclose(loop.transform(X_new), U, atol=1e-12)
+
+
+def test_vectorized_erf_accuracy_against_math_erf():
+    x = np.concatenate([np.linspace(-7, 7, 20_001), [0.0, 1.0, -1.0, np.inf, -np.inf]])
+    expected = np.array([math.erf(v) for v in x])
+    np.testing.assert_allclose(erf(x), expected, rtol=0, atol=1e-7)
+    assert np.isnan(erf(np.array([np.nan]))[0])
+
+    big = np.random.default_rng(8).normal(size=200_000) / math.sqrt(2.0)
+    np.testing.assert_allclose(erf(big), np.vectorize(math.erf)(big), rtol=0, atol=1e-7)
+
+
+@pytest.mark.skipif(not os.environ.get("PREPROCESSING_BENCHMARKS"), reason="set PREPROCESSING_BENCHMARKS=1 to run")
+def test_vectorized_erf_speed_against_math_erf():
+    # Measured ~12x over np.vectorize(math.erf) on 1M elements, short of the 50x
+    # originally asked for: at ~160 ns per math.erf call, 50x would leave ~3 ns
+    # per element, about four NumPy passes, and the 1e-7 accuracy needs ~25.
+    big = np.random.default_rng(8).normal(size=1_000_000) / math.sqrt(2.0)
+    t_ref = min(_timed(np.vectorize(math.erf), big) for _ in range(3))
+    t_fast = min(_timed(erf, big) for _ in range(5))
+    assert t_fast * 8 < t_ref
+
+
+def _timed(fn, arg) -> float:
+    t0 = time.perf_counter()
+    fn(arg)
+    return time.perf_counter() - t0
+
+
+def test_quantile_transformer_normal_inverse_roundtrip():
+    rng = np.random.default_rng(9)
+    X = rng.gamma(2.0, size=(2000, 3))
+    qt = QuantileTransformer(n_quantiles=500, output_distribution="normal").fit(X)
+    Xinv = qt.inverse_transform(qt.transform(X))
+    inner = (X > np.quantile(X, 0.01, axis=0)) & (X < np.quantile(X, 0.99, axis=0))
+    np.testing.assert_allclose(Xinv[inner], X[inner], rtol=1e-3, atol=1e-3)
+
+
+@pytest.mark.parametrize(
+    "scaler_cls",
+    [RobustScaler, MedianMADScaler, StandardScaler, MinMaxScaler, QuantileTransformer],
+)
+def test_scaler_dtype_policy(scaler_cls):
+    rng = np.random.default_rng(10)
+    X = rng.normal(size=(300, 3))
+    ref = scaler_cls().fit(X)
+    f32 = scaler_cls(dtype="float32").fit(X)
+    Z = f32.transform(X)
+    assert Z.dtype == np.float32
+    assert f32.inverse_transform(Z).dtype == np.float32
+    np.testing.assert_allclose(Z, ref.transform(X), rtol=1e-4, atol=1e-4)
+
+    preserve = scaler_cls(dtype="preserve")
+    assert preserve.fit(X.astype(np.float32)).transform(X).dtype == np.float32
+    assert preserve.fit(np.arange(30).reshape(10, 3)).transform(X).dtype == np.float64
+    with pytest.raises(ValueError):
+        scaler_cls(dtype="int8")
+
+
+@pytest.mark.parametrize(
+    "scaler",
+    [
+        RobustScaler(),
+        MedianMADScaler(),
+        StandardScaler(outlier_detection="iqr", clip_outliers=True),
+        MinMaxScaler(clip=True),
+    ],
+)
+def test_affine_scaler_out_and_in_place(scaler):
+    rng = np.random.default_rng(11)
+    X = rng.normal(size=(200, 4))
+    scaler.fit(X)
+    expected = scaler.transform(X)
+
+    buf = np.empty_like(X)
+    assert scaler.transform(X, out=buf) is buf
+    np.testing.assert_allclose(buf, expected)
+    assert scaler.inverse_transform(expected, out=buf) is buf
+    np.testing.assert_allclose(scaler.inverse_transform(expected), buf)
+
+    X_work = X.copy()
+    assert scaler.transform(X_work, copy=False) is X_work
+    np.testing.assert_allclose(X_work, expected)
+    assert scaler.transform(X, copy=True) is not X
+    with pytest.raises(ValueError):
+        scaler.transform(X, out=np.empty((3, 4)))
+
+    # copy=False never writes through to a caller's DataFrame
+    df = pd.DataFrame(X.copy(), columns=list("abcd"))
+    before = df.copy()
+    np.testing.assert_allclose(scaler.transform(df, copy=False).to_numpy(), expected)
+    np.testing.assert_allclose(scaler.inverse_transform(df, copy=False).to_numpy(), scaler.inverse_transform(X))
+    pd.testing.assert_frame_equal(df, before)
+
+
 @pytest.mark.skipif(not HYP_AVAILABLE, reason="hypothesis not installed")
 @given(st.integers(min_value=1, max_value=5), st.integers(min_value=1, max_value=4))
 def test_minmax_inverse_property_based(n_rows: int, n_cols: int):
@@ -109,3 +319,44 @@ def test_standard_scaler_numerical_stability(n: int):
     assert np.all(np.isfinite(means)) and np.all(np.isfinite(stds))
     assert np.all(np.abs(means) < 1e-6)
     assert np.all(np.abs(stds - 1) < 1e-5)
+
+
+@pytest.mark.parametrize(
+    "scaler_cls",
+    # n_quantiles below every column's observed count so the grids line up
+    [RobustScaler, MedianMADScaler, StandardScaler, MinMaxScaler, partial(QuantileTransformer, n_quantiles=100)],
+)
+def test_scaler_nan_policy_omit_matches_fit_on_observed(scaler_cls):
+    rng = np.random.default_rng(12)
+    X = rng.normal(size=(400, 3))
+    X_nan = X.copy()
+    holes = rng.random(X.shape) < 0.1
+    holes[:, 0] = False
+    X_nan[holes] = np.nan
+
+    omit = scaler_cls(nan_policy="omit").fit(X_nan)
+    Z = omit.transform(X_nan)
+    assert np.array_equal(np.isnan(Z), holes)
+    for j in range(X.shape[1]):
+        observed = X_nan[~holes[:, j], j : j + 1]
+        ref = scaler_cls().fit(observed).transform(observed)
+        np.testing.assert_allclose(Z[~holes[:, j], j : j + 1], ref, rtol=1e-9, atol=1e-9)
+    assert np.array_equal(np.isnan(omit.inverse_transform(Z)), holes)
+
+    propagate = scaler_cls().fit(X_nan)
+    assert not np.isnan(propagate.transform(X_nan)[:, 0]).any()
+    with pytest.raises(ValueError):
+        scaler_cls(nan_policy="drop")
+
+
+def test_nan_omit_partial_fit_matches_fit():
+    rng = np.random.default_rng(13)
+    X = rng.normal(size=(300, 3))
+    X[rng.random(X.shape) < 0.2] = np.nan
+    X[:100, 2] = np.nan  # first chunk sees no values for the last feature
+    for cls in (StandardScaler, MinMaxScaler):
+        full = cls(nan_policy="omit").fit(X)
+        inc = cls(nan_policy="omit")
+        for chunk in np.array_split(X, 3):
+            inc.partial_fit(chunk)
+        np.testing.assert_allclose(inc.transform(X), full.transform(X), rtol=1e-10, equal_nan=True)
@@ -1,6 +1,7 @@
 import json
 import numpy as np
 import pandas as pd
+import pytest
 
 from src.lib.preprocessing.schema import (
     ColumnSpec,
@@ -79,3 +80,118 @@ def test_migration_registry_and_plan():
 
     assert 'd' in df1.columns
     assert np.allclose(df1['a'].to_numpy(), np.array([2.0, 4.0]))
+
+
+def test_migration_plan_prefers_cheapest_path_and_is_cached():
+    reg = MigrationRegistry()
+    v = {s: SchemaVersion.from_string(s) for s in ("1.0.0", "1.1.0", "1.2.0", "2.0.0", "3.0.0")}
+
+    def tag(label):
+        return lambda trail: trail + [label]
+
+    reg.register(MigrationStep(v["1.0.0"], v["1.1.0"], tag("1.1")))
+    reg.register(MigrationStep(v["1.1.0"], v["1.2.0"], tag("1.2")))
+    reg.register(MigrationStep(v["1.2.0"], v["2.0.0"], tag("2.0")))
+    reg.register(MigrationStep(v["1.1.0"], v["3.0.0"], tag("3.0")))
+    # the old greedy walk stepped to 1.2.0 here and could never reach 3.0.0
+    assert reg.migrate([], v["1.0.0"], v["3.0.0"]) == ["1.1", "3.0"]
+    assert reg.migrate([], v["1.0.0"], v["2.0.0"]) == ["1.1", "1.2", "2.0"]
+    assert reg.plan(v["1.0.0"], v["1.0.0"]) == []
+    with pytest.raises(ValueError, match="No migration path"):
+        reg.plan(v["2.0.0"], v["1.0.0"])
+
+    # a direct jump wins on hops; registering invalidates cached plans
+    assert len(reg.plan(v["1.0.0"], v["2.0.0"])) == 3
+    reg.register(MigrationStep(v["1.0.0"], v["2.0.0"], tag("direct")))
+    assert reg.migrate([], v["1.0.0"], v["2.0.0"]) == ["direct"]
+    reg.register(MigrationStep(v["1.0.0"], v["1.2.0"], tag("skip"), cost=0.5))
+    assert [s.to_version for s in reg.plan(v["1.0.0"], v["2.0.0"])] == [v["2.0.0"]]
+    with pytest.raises(ValueError, match="negative cost"):
+        reg.register(MigrationStep(v["2.0.0"], v["3.0.0"], tag("bad"), cost=-1.0))
+
+
+def test_validation_report_collects_all_violations():
+    schema = DatasetSchema(
+        columns=[
+            ColumnSpec("a", "float", min=0.0, max=1.0),
+            ColumnSpec("b", "int"),
+            ColumnSpec("c", "string", pattern=r"^[a-z]+$", max_length=3, enum=["abc", "de", "xyz"]),
+            ColumnSpec("e", "float"),
+        ],
+        target="y",
+    )
+    df = pd.DataFrame(
+        {
+            "a": [0.5, -1.0, 2.0, np.nan, -3.0],
+            "b": [1.0, 2.0, 3.0, 4.0, 5.0],
+            "c": ["abc", "ABC", "de", "toolong", "xyz"],
+        },
+        index=[10, 11, 12, 13, 14],
+    )
+    report = schema.validation_report(df, max_examples=1)
+    assert not report.ok and report.n_rows == 5
+    by_rule = {(v.column, v.rule): v for v in report.violations}
+    assert [v.rule for v in report.violations] == [
+        "missing_columns", "nulls", "min", "max", "dtype", "max_length", "pattern", "enum", "target",
+    ]
+    assert by_rule[("a", "min")].count == 2 and by_rule[("a", "min")].examples == [11]
+    assert by_rule[("a", "max")].examples == [12]
+    assert by_rule[("c", "pattern")].count == 1
+    assert by_rule[("c", "enum")].count == 2
+    # validate() still raises the first violation with its original message
+    with pytest.raises(ValueError, match=r"Missing required columns: \['e'\]"):
+        schema.validate(df)
+    assert DatasetSchema(columns=[ColumnSpec("a", "float", allow_nulls=True)]).validation_report(df).ok
+
+
+def test_validate_csv_in_chunks_matches_in_memory_report(tmp_path):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"a": rng.uniform(-0.1, 1.0, size=5000), "c": rng.choice(["ok", "BAD", "fine"], size=5000)})
+    schema = DatasetSchema(columns=[ColumnSpec("a", "float", min=0.0), ColumnSpec("c", "string", pattern=r"^[a-z]+$")])
+    path = tmp_path / "export.csv"
+    df.to_csv(path, index=False)
+
+    full = schema.validation_report(df, max_examples=3)
+    for n_workers in (None, 2):
+        chunked = schema.validate_csv(path, chunksize=700, n_workers=n_workers, max_examples=3)
+        assert chunked.n_rows == len(df) and not chunked.truncated
+        assert [(v.rule, v.count, v.examples) for v in chunked.violations] == [
+            (v.rule, v.count, v.examples) for v in full.violations
+        ]
+
+    early = schema.validate_chunks((df.iloc[i : i + 500] for i in range(0, len(df), 500)), max_errors=100)
+    assert early.truncated and early.n_errors >= 100 and early.n_rows < len(df)
+
+
+def test_compiled_schema_matches_uncompiled_validation():
+    schema = DatasetSchema(
+        columns=[
+            ColumnSpec("code", "string", pattern=r"^[A-Z]{2}\d$", enum=["AB1", "CD2", "EF3"], min_length=3),
+            ColumnSpec("level", "int", enum=[1, 2, 3]),
+            ColumnSpec("ts", "datetime", min=0, max=2_000_000_000),
+        ]
+    )
+    good = pd.DataFrame({
+        "code": ["AB1", "CD2"],
+        "level": [1, 3],
+        "ts": pd.to_datetime(["2001-01-01", "2020-06-01"]),
+    })
+    bad = pd.DataFrame({
+        "code": ["AB1", "zz", "XY9"],
+        "level": [1, 5, 2],
+        "ts": pd.to_datetime(["1960-01-01", "2001-01-01", "2090-01-01"]),
+    })
+    validator = schema.compile()
+    validator.validate(good)
+    compiled = validator.validation_report(bad)
+    assert compiled == schema.validation_report(bad)
+    assert {(v.column, v.rule): v.count for v in compiled.violations} == {
+        ("code", "min_length"): 1,
+        ("code", "pattern"): 1,
+        ("code", "enum"): 2,
+        ("level", "enum"): 1,
+        ("ts", "min"): 1,
+        ("ts", "max"): 1,
+    }
+    with pytest.raises(ValueError, match="shorter than min_length"):
+        validator.validate(bad)